@@ -57,11 +57,13 @@ def process_isis(isis):
 
     adj_state = {0: "Up", 1: "Init", 2: "Fail"}
     adj_bfd_state = {0: "None", 1: "Down", 2: "Init", 3: "Up"}
+    intf_digits = re.compile(r'\D+')
 
-    if isis.instances.instance:
-        show_isis_adj = str()
-    else:
-        show_isis_adj = "No IS-IS instances found"
+    if not isis.instances.instance:
+        return "No IS-IS instances found"
+
+    # collect output lines and join them once at the end
+    show_isis_adj = []
 
     # iterate over all instances
     for instance in isis.instances.instance:
@@ -71,17 +73,17 @@ def process_isis(isis):
         # iterate over all levels
         for level in instance.levels.level:
             if show_isis_adj:
-                show_isis_adj += "\n\n"
+                show_isis_adj.append("")  # blank line between levels
 
-            show_isis_adj += isis_header.format(instance=instance.instance_name,
-                                                level=level.level.value)
+            show_isis_adj.append(isis_header.format(
+                instance=instance.instance_name, level=level.level.value))
             adj_count = 0
             # iterate over all adjacencies
             for adjacency in level.adjacencies.adjacency:
                 adj_count += 1
                 sys_id = host_names[adjacency.adjacency_system_id]
                 intf = (adjacency.adjacency_interface[:2] +
-                        re.sub(r'\D+', "", adjacency.adjacency_interface, 1))
+                        intf_digits.sub("", adjacency.adjacency_interface, 1))
                 snpa = adjacency.adjacency_snpa
                 state = adj_state[adjacency.adjacency_state.value]
                 hold = adjacency.adjacency_holdtime
@@ -93,22 +95,21 @@ def process_isis(isis):
                 v4_bfd = adj_bfd_state[adjacency.adjacency_ipv6bfd_state.value]
                 v6_bfd = adj_bfd_state[adjacency.adjacency_bfd_state.value]
 
-                show_isis_adj += ("\n" +
-                                  isis_row.format(sys_id=sys_id,
-                                                  intf=intf,
-                                                  snpa=snpa,
-                                                  state=state,
-                                                  hold=hold,
-                                                  changed=changed,
-                                                  ietf_nsf=ietf_nsf,
-                                                  v4_bfd=v4_bfd,
-                                                  v6_bfd=v6_bfd))
+                show_isis_adj.append(isis_row.format(sys_id=sys_id,
+                                                     intf=intf,
+                                                     snpa=snpa,
+                                                     state=state,
+                                                     hold=hold,
+                                                     changed=changed,
+                                                     ietf_nsf=ietf_nsf,
+                                                     v4_bfd=v4_bfd,
+                                                     v6_bfd=v6_bfd))
             if adj_count:
-                show_isis_adj += ("\n\n" +
-                                  isis_trailer.format(count=adj_count))
+                show_isis_adj.append("\n" +
+                                     isis_trailer.format(count=adj_count))
 
     # return formatted string
-    return(show_isis_adj)
+    return("\n".join(show_isis_adj))
 
 
 if __name__ == "__main__":
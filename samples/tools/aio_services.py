@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Asyncio front end for YDK CRUD and Executor services (Python 3.5+).
+
+YDK services block on device round-trips, so every call is offloaded to a
+bounded thread pool.  A semaphore bounds the number of open NETCONF
+sessions (a session holds its slot from connect until close) and a
+per-session lock serializes calls on each session, so operations in
+flight are bounded too.  map_bounded runs a coroutine function over a
+lazily read iterable of devices with a bounded number of tasks.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from session_pool import create_provider
+
+logger = logging.getLogger("ydk.samples.aio_services")
+
+
+class AsyncSession(object):
+    """NETCONF provider owned by an event loop."""
+
+    def __init__(self, url, provider):
+        self.url = url
+        self.provider = provider
+        self.lock = asyncio.Lock()
+
+
+class AsyncServices(object):
+    """Awaitable CRUD and Executor calls with backpressure.
+
+    Create instances from a coroutine running in the event loop that will
+    use them.
+    """
+
+    def __init__(self, max_workers=64, max_sessions=None,
+                 factory=create_provider):
+        """max_sessions defaults to max_workers."""
+        self.factory = factory
+        self._executor = ThreadPoolExecutor(max_workers)
+        self._sessions = asyncio.Semaphore(max_sessions or max_workers)
+
+    async def connect(self, url):
+        """Open NETCONF session to device URL.
+
+        Waits while max_sessions sessions are open; the session must be
+        closed with close() to release its slot.
+        """
+        await self._sessions.acquire()
+        try:
+            provider = await self._offload(self.factory, url)
+        except BaseException:
+            self._sessions.release()
+            raise
+        return AsyncSession(url, provider)
+
+    async def close(self, session):
+        """Close NETCONF session and release its slot."""
+        try:
+            async with session.lock:
+                await self._offload(session.provider.close)
+        finally:
+            self._sessions.release()
+
+    async def create(self, session, entity):
+        """Create entity configuration on device."""
+        return await self._call(session, "create", entity)
+
+    async def read(self, session, entity):
+        """Read entity data from device."""
+        return await self._call(session, "read", entity)
+
+    async def update(self, session, entity):
+        """Update entity configuration on device."""
+        return await self._call(session, "update", entity)
+
+    async def delete(self, session, entity):
+        """Delete entity configuration from device."""
+        return await self._call(session, "delete", entity)
+
+    async def execute_rpc(self, session, rpc):
+        """Execute RPC on device."""
+        from ydk.services import ExecutorService
+
+        async with session.lock:
+            return await self._offload(ExecutorService().execute_rpc,
+                                       session.provider, rpc)
+
+    async def run_app(self, session, app, obj=None):
+        """Replay a sample app's service call on session."""
+        async with session.lock:
+            return await self._offload(app.run, session.provider, obj)
+
+    def shutdown(self):
+        """Wait for pending calls and release worker threads."""
+        self._executor.shutdown(wait=True)
+
+    async def _call(self, session, operation, entity):
+        from ydk.services import CRUDService
+
+        async with session.lock:
+            return await self._offload(getattr(CRUDService(), operation),
+                                       session.provider, entity)
+
+    async def _offload(self, function, *args):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._executor, function, *args)
+
+
+async def map_bounded(function, items, limit, callback):
+    """Await function(item) for every item, at most limit at a time.
+
+    Items are taken from the iterable only when a task is free, so a long
+    inventory is never held in memory.  callback(item, result, error) is
+    called as each call completes.
+    """
+    items = iter(items)
+
+    async def worker():
+        for item in items:
+            try:
+                result = await function(item)
+            except Exception as error:
+                callback(item, None, error)
+            else:
+                callback(item, result, None)
+
+    await asyncio.gather(*[worker() for _ in range(max(1, limit))])
+
+
+def run(coroutine):
+    """Run coroutine to completion on a new event loop."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
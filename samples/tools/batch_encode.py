@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Encode configuration for many devices in one run.
+
+Records are read as JSON lines, one document per line:
+
+  {"device": "pe1", "app": "path/to/cd-encode-xr-ip-ntp-cfg-20-ydk.py",
+   "function": "config_ntp", "params": {}}
+
+The top-level object of the app is created and populated by function
+(default: the app's config_* function) called as function(obj, **params).
+Each worker process creates one CodecServiceProvider and one CodecService
+and reuses them, and imports each app once, for all the records it encodes.
+Records are handed to the workers as results come back, with at most a
+few chunks per worker outstanding, so a large stream of records is never
+held in memory.  Payloads are written as they finish, either as JSON lines
+on stdout or as OUTPUT/<device>/<app>.xml files (names reduced to safe
+characters; a repeated device and app gets <app>-2.xml and so on), and
+the rate is reported in documents per second.  With -d, payloads are
+looked up in an encode cache directory (encode_cache.py) shared by all
+workers and runs, so unchanged objects are not encoded again.
+
+usage: batch_encode.py [-h] [-v] [-j JOBS] [-c CHUNK_SIZE] [-o OUTPUT]
+                       [-d CACHE]
+                       [records]
+
+positional arguments:
+  records               JSON lines file with records (default: stdin)
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -v, --verbose         print debugging messages
+  -j JOBS, --jobs JOBS  worker processes (0 encodes in this process)
+  -c CHUNK_SIZE, --chunk-size CHUNK_SIZE
+                        records sent to a worker at a time
+  -o OUTPUT, --output OUTPUT
+                        output directory (default: JSON lines on stdout)
+  -d CACHE, --cache CACHE
+                        encode cache directory
+"""
+
+from argparse import ArgumentParser
+from timeit import default_timer
+import json
+import logging
+import multiprocessing
+import os
+import re
+import sys
+import threading
+
+from sample_app import SampleApp, enable_logging
+from encode_cache import EncodeCache
+
+logger = logging.getLogger("ydk.samples.batch_encode")
+
+# codec provider, codec service, encode cache and loaded apps of the
+# current process
+_codec = None
+_cache = None
+_apps = {}
+
+
+def init_worker(verbose=False, cache_directory=None):
+    """Create the codec provider and service shared by all records."""
+    global _codec, _cache
+    from ydk.services import CodecService
+    from ydk.providers import CodecServiceProvider
+
+    # forked workers inherit the handler of the parent process
+    enable_logging(verbose and not logging.getLogger("ydk").handlers)
+    _codec = (CodecServiceProvider(type="xml"), CodecService())
+    if cache_directory:
+        _cache = EncodeCache(cache_directory)
+
+
+def load_app(path):
+    """Sample app for path, imported once per process."""
+    app = _apps.get(path)
+    if app is None:
+        app = _apps[path] = SampleApp(path)
+    return app
+
+
+def build(record):
+    """Create and populate the top-level object of a record."""
+    app = load_app(record["app"])
+    obj = app.new_object()
+    function = record.get("function")
+    function = getattr(app.module, function) if function else app.builder
+    if function is not None:
+        function(obj, **record.get("params", {}))
+    return app, obj
+
+
+def encode_record(record):
+    """Encode one record; return result dict with payload or error."""
+    start = default_timer()
+    result = {"device": record.get("device"),
+              "app": os.path.basename(record["app"])[:-3]}
+    try:
+        app, obj = build(record)
+        provider, codec = _codec
+        entity = app.call_argument(obj)
+        if _cache is not None:
+            result["payload"] = _cache.encode(codec, provider, entity)
+        else:
+            result["payload"] = codec.encode(provider, entity)
+    except Exception as error:
+        logger.debug("Encoding %s failed", record, exc_info=True)
+        result["error"] = "%s: %s" % (type(error).__name__, error)
+    result["time"] = round(default_timer() - start, 6)
+    return result
+
+
+def read_records(records_file):
+    """Yield records from JSON lines, skipping blank and comment lines."""
+    for line in records_file:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield json.loads(line)
+
+
+def _bounded(records, slots, stop):
+    """Yield records, each after taking one of the slots."""
+    for record in records:
+        slots.acquire()
+        if stop.is_set():
+            return
+        yield record
+
+
+def encode_batch(records, jobs=None, chunk_size=16, verbose=False,
+                 cache_directory=None):
+    """Yield encode results as they finish.
+
+    Results arrive in completion order, not in record order.  The pool
+    reads records from its own thread as fast as it can, so at most two
+    chunks per worker are taken from records before their results are
+    consumed.  With jobs=0 records are encoded in the calling process.
+    """
+    if jobs == 0:
+        init_worker(verbose, cache_directory)
+        for record in records:
+            yield encode_record(record)
+        return
+    jobs = jobs or multiprocessing.cpu_count()
+    slots = threading.Semaphore(jobs * chunk_size * 2)
+    stop = threading.Event()
+    pool = multiprocessing.Pool(jobs, initializer=init_worker,
+                                initargs=(verbose, cache_directory))
+    try:
+        for result in pool.imap_unordered(
+                encode_record, _bounded(records, slots, stop), chunk_size):
+            slots.release()
+            yield result
+        pool.close()
+    finally:
+        # let a pool thread waiting for a slot finish
+        stop.set()
+        slots.release()
+        pool.terminate()
+        pool.join()
+
+
+def safe_name(name):
+    """Name reduced to characters safe in a file name ("_" if empty)."""
+    name = re.sub(r"[^\w.-]", "_", name or "").lstrip(".")
+    return name or "_"
+
+
+def write_file(directory, result, written):
+    """Write payload of result to directory/device/app.xml.
+
+    written counts the files of each device and app in this run, so a
+    repeated device and app is written to app-2.xml and so on.
+    """
+    device_dir = os.path.join(directory, safe_name(result["device"]))
+    name = safe_name(result["app"])
+    count = written[device_dir, name] = written.get((device_dir, name), 0) + 1
+    if count > 1:
+        name = "%s-%d" % (name, count)
+    if not os.path.isdir(device_dir):
+        os.makedirs(device_dir)
+    with open(os.path.join(device_dir, name + ".xml"), "w") as f:
+        f.write(result["payload"])
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-v", "--verbose", help="print debugging messages",
+                        action="store_true")
+    parser.add_argument("-j", "--jobs", type=int,
+                        help="worker processes (0 encodes in this process)")
+    parser.add_argument("-c", "--chunk-size", type=int, default=16,
+                        help="records sent to a worker at a time")
+    parser.add_argument("-o", "--output",
+                        help="output directory (default: JSON lines on "
+                             "stdout)")
+    parser.add_argument("-d", "--cache", help="encode cache directory")
+    parser.add_argument("records", nargs="?",
+                        help="JSON lines file with records (default: stdin)")
+    args = parser.parse_args()
+    enable_logging(args.verbose)
+
+    records = read_records(open(args.records) if args.records
+                           else sys.stdin)
+    count = errors = 0
+    written = {}
+    start = default_timer()
+    for result in encode_batch(records, args.jobs, args.chunk_size,
+                               args.verbose, args.cache):
+        count += 1
+        if "error" in result:
+            errors += 1
+            sys.stderr.write("{device} {app}: {error}\n".format(**result))
+        elif args.output:
+            write_file(args.output, result, written)
+        else:
+            sys.stdout.write(json.dumps(result, sort_keys=True) + "\n")
+    elapsed = default_timer() - start
+    sys.stderr.write("{count} documents ({errors} errors) in {time:.3f}s, "
+                     "{rate:.1f} documents/s\n".format(
+                         count=count, errors=errors, time=elapsed,
+                         rate=count / elapsed if elapsed else 0.0))
+    exit()
+# End of script
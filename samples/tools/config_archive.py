@@ -0,0 +1,295 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Archive encoded payloads with chunk deduplication and compression.
+
+An archive is a directory with an append-only chunk file (chunks.dat) and
+an append-only index (index.jsonl).  Payloads are split into chunks at
+content-defined line boundaries, so an edit only changes the chunks around
+it, and every distinct chunk is stored once for all devices, compressed
+with zstd (if the zstandard package is installed) or zlib.  Documents are
+indexed by (device, model, timestamp) and read back by decompressing only
+their chunks from the memory-mapped chunk file.
+
+Files added without --device and --model are named like the output of
+batch_encode.py: <device>/<model>.xml.
+
+usage: config_archive.py [-h] [-v] archive {add,get,list,stats} ...
+
+positional arguments:
+  archive               archive directory
+  {add,get,list,stats}
+    add                 add payload files
+    get                 print a document
+    list                list documents
+    stats               print storage statistics
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -v, --verbose         print debugging messages
+"""
+
+from argparse import ArgumentParser
+from bisect import bisect_right, insort
+from collections import namedtuple
+import hashlib
+import json
+import logging
+import mmap
+import os
+import sys
+import time
+import zlib
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from sample_app import enable_logging
+
+CHUNKS = "chunks.dat"
+INDEX = "index.jsonl"
+
+# a chunk ends after a line whose hash has these bits clear (~64 lines)
+BOUNDARY_MASK = 0x3f
+MIN_CHUNK = 1024
+MAX_CHUNK = 64 << 10
+
+logger = logging.getLogger("ydk.samples.config_archive")
+
+Chunk = namedtuple("Chunk", "offset size codec")
+Document = namedtuple("Document", "device model timestamp chunks size")
+
+
+def split_chunks(payload):
+    """Split payload bytes into content-defined chunks of whole lines."""
+    chunks = []
+    start = 0
+    position = 0
+    length = len(payload)
+    while position < length:
+        end = payload.find(b"\n", position)
+        end = length if end < 0 else end + 1
+        line = payload[position:end]
+        position = end
+        size = position - start
+        if (size >= MAX_CHUNK or
+                (size >= MIN_CHUNK and
+                 not zlib.crc32(line) & BOUNDARY_MASK)):
+            chunks.append(payload[start:position])
+            start = position
+    if start < length:
+        chunks.append(payload[start:])
+    return chunks
+
+
+def compress(data):
+    """Compressed data and codec name."""
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=10).compress(data), "zstd"
+    return zlib.compress(data, 9), "zlib"
+
+
+def decompress(data, codec):
+    """Decompress data compressed with codec."""
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("zstandard package required for zstd chunks")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+class ConfigArchive(object):
+    """Deduplicated archive of payloads by device, model and timestamp."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self.chunks = {}
+        self.documents = {}
+        self._timestamps = {}
+        self._mmap = None
+        self._mmap_size = 0
+        path = os.path.join(directory, INDEX)
+        if os.path.exists(path):
+            with open(path) as index:
+                for line in index:
+                    self._load(json.loads(line))
+        self._data = open(os.path.join(directory, CHUNKS), "ab")
+        self._index = open(path, "a")
+
+    def _load(self, record):
+        if record["type"] == "chunk":
+            self.chunks[record["id"]] = Chunk(record["offset"],
+                                              record["size"], record["codec"])
+        else:
+            document = Document(record["device"], record["model"],
+                                record["timestamp"], record["chunks"],
+                                record["size"])
+            self.documents[document[:3]] = document
+            insort(self._timestamps.setdefault(document[:2], []),
+                   document.timestamp)
+
+    def _append(self, record):
+        self._index.write(json.dumps(record, sort_keys=True) + "\n")
+        self._load(record)
+
+    def add(self, device, model, payload, timestamp=None):
+        """Store payload; return number of new chunks."""
+        if not isinstance(payload, bytes):
+            payload = payload.encode("utf-8")
+        timestamp = time.time() if timestamp is None else timestamp
+        ids = []
+        new = 0
+        for chunk in split_chunks(payload):
+            chunk_id = hashlib.sha256(chunk).hexdigest()[:32]
+            ids.append(chunk_id)
+            if chunk_id in self.chunks:
+                continue
+            data, codec = compress(chunk)
+            self._data.seek(0, os.SEEK_END)
+            offset = self._data.tell()
+            self._data.write(data)
+            self._append({"type": "chunk", "id": chunk_id, "offset": offset,
+                          "size": len(data), "codec": codec})
+            new += 1
+        # chunks are written before the document referencing them
+        self._data.flush()
+        self._append({"type": "document", "device": device, "model": model,
+                      "timestamp": timestamp, "chunks": ids,
+                      "size": len(payload)})
+        self._index.flush()
+        return new
+
+    def find(self, device, model, timestamp=None):
+        """Latest document of device and model at or before timestamp."""
+        timestamps = self._timestamps.get((device, model), [])
+        index = len(timestamps) if timestamp is None else \
+            bisect_right(timestamps, timestamp)
+        if not index:
+            raise KeyError("no document for %s %s" % (device, model))
+        return self.documents[(device, model, timestamps[index - 1])]
+
+    def read(self, document):
+        """Payload bytes of a document."""
+        return b"".join(self._read_chunk(chunk_id)
+                        for chunk_id in document.chunks)
+
+    def get(self, device, model, timestamp=None):
+        """Payload bytes of the latest document at or before timestamp."""
+        return self.read(self.find(device, model, timestamp))
+
+    def _read_chunk(self, chunk_id):
+        chunk = self.chunks[chunk_id]
+        end = chunk.offset + chunk.size
+        if self._mmap is None or end > self._mmap_size:
+            self._remap()
+        return decompress(self._mmap[chunk.offset:end], chunk.codec)
+
+    def _remap(self):
+        """Map the chunk file again after it grew."""
+        if self._mmap is not None:
+            self._mmap.close()
+        self._data.flush()
+        with open(os.path.join(self.directory, CHUNKS), "rb") as data:
+            self._mmap_size = os.fstat(data.fileno()).st_size
+            self._mmap = mmap.mmap(data.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+
+    def stats(self):
+        """Raw bytes, stored bytes (chunks and index), documents and chunks."""
+        raw = sum(document.size for document in self.documents.values())
+        self._index.flush()
+        stored = (sum(chunk.size for chunk in self.chunks.values()) +
+                  os.path.getsize(os.path.join(self.directory, INDEX)))
+        return dict(documents=len(self.documents), chunks=len(self.chunks),
+                    raw_bytes=raw, stored_bytes=stored,
+                    ratio=float(raw) / stored if stored else 0.0)
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+        self._data.close()
+        self._index.close()
+
+
+def name_from_path(path):
+    """(device, model) from a <device>/<model>.xml path."""
+    directory, filename = os.path.split(os.path.abspath(path))
+    return os.path.basename(directory), os.path.splitext(filename)[0]
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-v", "--verbose", help="print debugging messages",
+                        action="store_true")
+    parser.add_argument("archive", help="archive directory")
+    commands = parser.add_subparsers(dest="command")
+    add = commands.add_parser("add", help="add payload files")
+    add.add_argument("-d", "--device", help="device name")
+    add.add_argument("-m", "--model", help="model name")
+    add.add_argument("-t", "--timestamp", type=float,
+                     help="seconds since the epoch (default: now)")
+    add.add_argument("file", nargs="+", help="payload file")
+    get = commands.add_parser("get", help="print a document")
+    get.add_argument("-t", "--timestamp", type=float,
+                     help="latest document at or before timestamp")
+    get.add_argument("device", help="device name")
+    get.add_argument("model", help="model name")
+    listing = commands.add_parser("list", help="list documents")
+    listing.add_argument("-d", "--device", help="only list device")
+    commands.add_parser("stats", help="print storage statistics")
+    args = parser.parse_args()
+    enable_logging(args.verbose)
+
+    archive = ConfigArchive(args.archive)
+    if args.command == "add":
+        timestamp = args.timestamp or time.time()
+        new = 0
+        for path in args.file:
+            device, model = name_from_path(path)
+            with open(path, "rb") as payload:
+                new += archive.add(args.device or device,
+                                   args.model or model, payload.read(),
+                                   timestamp)
+        print("{files} documents, {new} new chunks".format(
+            files=len(args.file), new=new))
+    elif args.command == "get":
+        try:
+            payload = archive.get(args.device, args.model, args.timestamp)
+        except KeyError as error:
+            sys.exit(error.args[0])
+        getattr(sys.stdout, "buffer", sys.stdout).write(payload)
+    elif args.command == "list":
+        for device, model, timestamp in sorted(archive.documents):
+            if args.device in (None, device):
+                document = archive.documents[(device, model, timestamp)]
+                print("{device} {model} {time} {size}".format(
+                    device=device, model=model, size=document.size,
+                    time=time.strftime("%Y-%m-%dT%H:%M:%S",
+                                       time.localtime(timestamp))))
+    else:
+        stats = archive.stats()
+        print("{documents} documents, {chunks} chunks, {raw_bytes} bytes "
+              "stored in {stored_bytes} ({ratio:.1f}x)".format(**stats))
+    archive.close()
+    exit()
+# End of script
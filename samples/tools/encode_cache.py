@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Cache encoded payloads by content of the encoded object.
+
+The fingerprint of a populated model object is a SHA-256 digest of its
+class and all set leafs, enum and identity leafs included.  List entries
+and leaf-lists are hashed in order: the meta information of YDK-Py 0.5
+does not record ordered-by, and reordering an ordered-by user list (e.g.
+routing policy statements) changes the configuration.
+Payloads are kept in an in-memory LRU and, optionally, in a cache directory
+shared between runs, both bounded in bytes.  The main program encodes the
+apps found several times through the cache and reports hits and misses.
+
+usage: encode_cache.py [-h] [-v] [-d DIRECTORY] [-m MEMORY] [-s SIZE]
+                       [-n ROUNDS]
+                       path [path ...]
+
+positional arguments:
+  path                  app file or directory
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -v, --verbose         print debugging messages
+  -d DIRECTORY, --directory DIRECTORY
+                        cache directory
+  -m MEMORY, --memory MEMORY
+                        in-memory cache size in bytes
+  -s SIZE, --size SIZE  cache directory size in bytes
+  -n ROUNDS, --rounds ROUNDS
+                        encode every app ROUNDS times
+"""
+
+from argparse import ArgumentParser
+from collections import OrderedDict
+from timeit import default_timer
+import hashlib
+import io
+import logging
+import os
+import tempfile
+
+from sample_app import find_apps, enable_logging
+from entity_tree import (members, leaf_value, LEAF, LEAF_LIST, CONTAINER,
+                         LIST)
+
+logger = logging.getLogger("ydk.samples.encode_cache")
+
+
+def fingerprint(entity):
+    """Hex digest identifying the content of a model object."""
+    return _digest(entity).hexdigest()
+
+
+def _digest(entity):
+    digest = hashlib.sha256()
+    cls = type(entity)
+    digest.update(("%s.%s\0" % (cls.__module__, cls.__name__)).encode())
+    for name, value, kind in members(entity):
+        if kind == LEAF:
+            if value is not None:
+                digest.update(("L%s=%s\0" % (name, leaf_value(value)))
+                              .encode("utf-8"))
+        elif kind == LEAF_LIST:
+            if value:
+                digest.update(("V%s=%s\0" % (name, "\0".join(
+                    leaf_value(v) for v in value))).encode("utf-8"))
+        elif kind == CONTAINER:
+            child = _digest(value).digest()
+            digest.update(("C%s\0" % name).encode() + child)
+        elif kind == LIST:
+            if not value:
+                continue
+            entries = [_digest(entry).digest() for entry in value]
+            digest.update(("T%s\0" % name).encode() + b"".join(entries))
+    return digest
+
+
+def _encoding(provider):
+    """Payload encoding of a codec provider."""
+    return str(getattr(provider, "encoding", None) or
+               getattr(provider, "type", None) or "xml")
+
+
+class EncodeCache(object):
+    """Encoded payloads by fingerprint in memory and in a directory."""
+
+    def __init__(self, directory=None, max_memory=64 << 20,
+                 max_size=1 << 30):
+        self.directory = directory
+        self.max_memory = max_memory
+        self.max_size = max_size
+        self._memory = OrderedDict()
+        self._memory_size = 0
+        self._disk_size = None
+        self.stats = dict(hits=0, misses=0, memory_hits=0, disk_hits=0,
+                          evictions=0)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def encode(self, codec, provider, entity):
+        """Encoded payload of entity, from cache or codec.encode."""
+        key = "%s-%s" % (fingerprint(entity), _encoding(provider))
+        payload = self.get(key)
+        if payload is None:
+            self.stats["misses"] += 1
+            payload = codec.encode(provider, entity)
+            self.put(key, payload)
+        else:
+            self.stats["hits"] += 1
+        return payload
+
+    def get(self, key):
+        """Cached payload for key (or None)."""
+        payload = self._memory.pop(key, None)
+        if payload is not None:
+            self._memory[key] = payload
+            self.stats["memory_hits"] += 1
+            return payload
+        path = self._path(key)
+        if path is None or not os.path.exists(path):
+            return None
+        with io.open(path, encoding="utf-8") as cache_file:
+            payload = cache_file.read()
+        os.utime(path, None)  # mark as recently used
+        self.stats["disk_hits"] += 1
+        self._remember(key, payload)
+        return payload
+
+    def put(self, key, payload):
+        """Store payload for key in memory and in the directory."""
+        self._remember(key, payload)
+        path = self._path(key)
+        if path is None:
+            return
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        # write and rename so concurrent runs never read partial payloads
+        handle, temp = tempfile.mkstemp(dir=os.path.dirname(path))
+        with io.open(handle, "w", encoding="utf-8") as cache_file:
+            cache_file.write(payload)
+        os.rename(temp, path)
+        if self._disk_size is not None:
+            self._disk_size += os.path.getsize(path)
+        self._evict_disk()
+
+    def clear(self):
+        """Empty the in-memory cache."""
+        self._memory.clear()
+        self._memory_size = 0
+
+    def _remember(self, key, payload):
+        self._memory[key] = payload
+        self._memory_size += len(payload)
+        while self._memory_size > self.max_memory and len(self._memory) > 1:
+            _, old = self._memory.popitem(last=False)
+            self._memory_size -= len(old)
+
+    def _path(self, key):
+        if not self.directory:
+            return None
+        return os.path.join(self.directory, key[:2], key[2:])
+
+    def _files(self):
+        for dirpath, _, filenames in os.walk(self.directory):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield stat.st_mtime, stat.st_size, path
+
+    def _evict_disk(self):
+        if self._disk_size is None:
+            self._disk_size = sum(size for _, size, _ in self._files())
+        if self._disk_size <= self.max_size:
+            return
+        # remove least recently used files down to 90% of the bound
+        for _, size, path in sorted(self._files()):
+            if self._disk_size <= self.max_size * 0.9:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._disk_size -= size
+            self.stats["evictions"] += 1
+            logger.debug("Evicted %s", path)
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-v", "--verbose", help="print debugging messages",
+                        action="store_true")
+    parser.add_argument("-d", "--directory", help="cache directory")
+    parser.add_argument("-m", "--memory", type=int, default=64 << 20,
+                        help="in-memory cache size in bytes")
+    parser.add_argument("-s", "--size", type=int, default=1 << 30,
+                        help="cache directory size in bytes")
+    parser.add_argument("-n", "--rounds", type=int, default=3,
+                        help="encode every app ROUNDS times")
+    parser.add_argument("path", nargs="+", help="app file or directory")
+    args = parser.parse_args()
+    enable_logging(args.verbose)
+
+    from ydk.services import CodecService
+    from ydk.providers import CodecServiceProvider
+
+    provider = CodecServiceProvider(type="xml")
+    codec = CodecService()
+    cache = EncodeCache(args.directory, args.memory, args.size)
+
+    objects = []
+    for app in find_apps(args.path):
+        try:
+            objects.append(app.call_argument(app.build()))
+        except Exception as error:
+            logger.info("Skipping %s: %s", app.name, error)
+
+    for round_number in range(1, args.rounds + 1):
+        hits, misses = cache.stats["hits"], cache.stats["misses"]
+        start = default_timer()
+        for obj in objects:
+            cache.encode(codec, provider, obj)
+        print("round {round}: {count} objects in {time:.3f}s, {hits} hits, "
+              "{misses} misses".format(
+                  round=round_number, count=len(objects),
+                  time=default_timer() - start,
+                  hits=cache.stats["hits"] - hits,
+                  misses=cache.stats["misses"] - misses))
+    print(", ".join("%s %d" % item for item in sorted(cache.stats.items())))
+
+    provider.close()
+    exit()
+# End of script
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Walk YDK entity trees generically.
+
+Model classes keep child containers, lists and leafs as plain attributes
+and describe them in their meta information (_meta_info).  These helpers
+classify the attributes of an entity and return the key leafs of list
+entries, so tools can diff, fingerprint or generate any model.
+"""
+
+from enum import Enum
+
+LEAF = "leaf"
+LEAF_LIST = "leaf-list"
+CONTAINER = "container"
+LIST = "list"
+
+
+def is_identity(value):
+    """Whether value is a YANG identity (identityref leaf value)."""
+    return type(value).__name__.endswith("Identity")
+
+
+def is_entity(value):
+    """Whether value is a YDK model object.
+
+    Enum members and identities have _meta_info too, but are leaf values.
+    """
+    return (hasattr(value, "_meta_info") and not isinstance(value, type) and
+            not isinstance(value, Enum) and not is_identity(value))
+
+
+_META_KINDS = None
+
+
+def _meta_kinds():
+    """Kinds of the YDK meta types (mtype) of class members."""
+    global _META_KINDS
+    if _META_KINDS is None:
+        try:
+            from ydk._core import _dm_meta_info as meta
+        except ImportError:
+            _META_KINDS = {}
+        else:
+            _META_KINDS = {meta.ATTRIBUTE: LEAF,
+                           meta.REFERENCE_CLASS: CONTAINER,
+                           meta.REFERENCE_LIST: LIST,
+                           meta.REFERENCE_LEAFLIST: LEAF_LIST,
+                           meta.REFERENCE_IDENTITY_CLASS: LEAF,
+                           meta.REFERENCE_ENUM_CLASS: LEAF,
+                           meta.REFERENCE_BITS: LEAF}
+    return _META_KINDS
+
+
+# model class -> [(attribute name, meta information, kind)]
+_MEMBER_INFOS = {}
+
+
+def _member_infos(entity):
+    """(attribute name, meta information or None, kind) in model order.
+
+    The kind is None when the meta information does not give it.
+    """
+    infos = _MEMBER_INFOS.get(type(entity))
+    if infos is not None:
+        return infos
+    try:
+        infos = [(member.presentation_name, member, meta_kind(member))
+                 for member in entity._meta_info().meta_info_class_members]
+    except (AttributeError, TypeError):
+        return [(name, None, None) for name in sorted(vars(entity))
+                if not name.startswith("_") and name != "parent"]
+    _MEMBER_INFOS[type(entity)] = infos
+    return infos
+
+
+def meta_kind(member):
+    """Kind of a class member from its meta type (None if unknown)."""
+    return _meta_kinds().get(getattr(member, "mtype", None))
+
+
+def member_kind(member, value):
+    """Kind of an attribute from its meta type, else from its value."""
+    kind = meta_kind(member)
+    if kind is not None:
+        return kind
+    if is_entity(value):
+        return CONTAINER
+    if isinstance(value, list):
+        if value and is_entity(value[0]):
+            return LIST
+        if value or not hasattr(value, "append"):
+            return LEAF_LIST
+        # empty list: entry kind unknown, no data either way
+        return LIST
+    return LEAF
+
+
+def members(entity):
+    """Yield (name, value, kind) for every attribute of entity."""
+    for name, member, kind in _member_infos(entity):
+        value = getattr(entity, name, None)
+        if kind is None:
+            kind = member_kind(member, value)
+        elif value is None and kind == CONTAINER:
+            # unset presence container
+            continue
+        yield name, value, kind
+
+
+def list_keys(entry):
+    """Names of the key leafs of a list entry."""
+    try:
+        return [member.presentation_name
+                for member in entry._meta_info().meta_info_class_members
+                if member.is_key]
+    except (AttributeError, TypeError):
+        return []
+
+
+def entry_key(entry):
+    """Key values identifying a list entry.
+
+    Entries of keyless lists are identified by all their leaf values.
+    """
+    names = list_keys(entry)
+    if not names:
+        names = [name for name, _, kind in members(entry) if kind == LEAF]
+    return tuple(leaf_value(getattr(entry, name, None)) for name in names)
+
+
+def list_item(value):
+    """Value of a leaf-list item (YLeafList wraps values in YListItem)."""
+    return value.item if type(value).__name__ == "YListItem" else value
+
+
+def leaf_value(value):
+    """Comparable representation of a leaf value."""
+    value = list_item(value)
+    if value is None:
+        return None
+    if type(value).__name__ == "Empty":
+        return "<empty>"
+    if hasattr(value, "name") and hasattr(type(value), "__members__"):
+        return value.name
+    if is_identity(value):
+        return type(value).__name__
+    return str(value)
+
+
+def has_data(entity):
+    """Whether any leaf below entity is set."""
+    for _, value, kind in members(entity):
+        if kind == LEAF and value is not None:
+            return True
+        if kind == LEAF_LIST and value:
+            return True
+        if kind == CONTAINER and has_data(value):
+            return True
+        if kind == LIST and value:
+            return True
+    return False
+
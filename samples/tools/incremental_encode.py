@@ -0,0 +1,325 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Re-encode only the list entries of a large object that changed.
+
+The payload of a top-level object is kept as a frame (the object with only
+the first entry of each split list) plus one encoded block per list entry.
+Split lists are given as attribute paths through containers, by default
+the neighbors and peer groups of openconfig-bgp.  YDK-Py 0.5 objects do not
+report changes, so every block is cached with the encode_cache.py
+fingerprint of its entry, and the frame with the fingerprint of the object
+without the split lists.  On every encode, the fingerprints are computed again and only
+new entries and entries whose fingerprint changed are encoded (each in an
+otherwise empty top-level object); removed entries are forgotten.  The
+frame is only re-encoded when its fingerprint changes or when a split list
+becomes empty or populated.  changed(entry) and changed() force
+re-encoding of an entry or the frame.  Entries are located in the encoded
+payload with an XML parser and the blocks are spliced into the frame in
+list order, giving the same payload as CodecService.
+
+The main program builds the object of nc-create-oc-bgp-43-ydk.py with
+COUNT additional IBGP neighbors, changes one neighbor and compares full and
+incremental re-encoding.
+
+usage: incremental_encode.py [-h] [-v] [-n COUNT] [-r REPEAT] [app]
+
+positional arguments:
+  app                   openconfig-bgp app with config_bgp function
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -v, --verbose         print debugging messages
+  -n COUNT, --count COUNT
+                        number of generated neighbors
+  -r REPEAT, --repeat REPEAT
+                        number of single neighbor changes
+"""
+
+from argparse import ArgumentParser
+from timeit import default_timer
+from xml.parsers import expat
+import logging
+import os
+
+from sample_app import SampleApp, enable_logging
+from encode_cache import fingerprint
+from stream_decode import yang_name
+from bulk_static_routes import generate_routes
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "basic",
+                   "crud", "models", "openconfig", "openconfig-bgp",
+                   "nc-create-oc-bgp-43-ydk.py")
+
+# lists of openconfig_bgp.Bgp encoded entry by entry
+BGP_LISTS = ("neighbors.neighbor", "peer_groups.peer_group")
+
+logger = logging.getLogger("ydk.samples.incremental_encode")
+
+
+def _resolve(entity, path):
+    """Parent container and list at attribute path."""
+    names = path.split(".")
+    for name in names[:-1]:
+        entity = getattr(entity, name)
+    return entity, getattr(entity, names[-1])
+
+
+def _replace(entries, new_entries):
+    """Replace contents of a list of entries (parent is kept)."""
+    del entries[:]
+    for entry in new_entries:
+        entries.append(entry)
+
+
+class _Found(Exception):
+    """Raised by the parser handlers to stop at the wanted element."""
+
+
+def entry_block(payload, tag, depth):
+    """Offsets of the first element tag at depth in payload.
+
+    The block starts with the whitespace before the element, so that
+    blocks of consecutive entries can be concatenated as encoded.
+    """
+    data = payload if isinstance(payload, bytes) else \
+        payload.encode("utf-8")
+    parser = expat.ParserCreate()
+    state = dict(depth=-1, start=None, content=False)
+
+    def start_element(name, attributes):
+        state["depth"] += 1
+        if state["start"] is None and state["depth"] == depth and \
+                name.rsplit(":", 1)[-1] == tag:
+            state["start"] = parser.CurrentByteIndex
+        elif state["start"] is not None:
+            state["content"] = True
+
+    def character_data(text):
+        if state["start"] is not None:
+            state["content"] = True
+
+    def end_element(name):
+        if state["start"] is not None and state["depth"] == depth:
+            index = parser.CurrentByteIndex
+            if not state["content"] and data[index - 2:index] == b"/>":
+                # empty element: index is past its "/>"
+                state["end"] = index
+            else:
+                # index of the end tag
+                state["end"] = data.index(b">", index) + 1
+            raise _Found()
+        state["depth"] -= 1
+
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    parser.CharacterDataHandler = character_data
+    try:
+        parser.Parse(data, True)
+    except _Found:
+        pass
+    if "end" not in state:
+        raise ValueError("no %s element in payload" % tag)
+    start, end = state["start"], state["end"]
+    while start > 0 and data[start - 1:start].isspace():
+        start -= 1
+    if data is not payload:
+        # byte offsets to text offsets
+        return (len(data[:start].decode("utf-8")),
+                len(data[:end].decode("utf-8")))
+    return start, end
+
+
+class IncrementalEncoder(object):
+    """Encode an object, reusing encoded list entries that did not change."""
+
+    def __init__(self, codec, provider, lists=BGP_LISTS):
+        self.codec = codec
+        self.provider = provider
+        self.lists = tuple(lists)
+        self._frame_key = None
+        self._frame = None
+        # per list: id(entry) -> (entry, fingerprint, block); the entry is
+        # kept so that its id is not reused while cached
+        self._blocks = dict((path, {}) for path in self.lists)
+        self._dirty = set()
+        self.stats = dict(frames=0, entries=0, reused=0, unmarked=0)
+
+    def changed(self, entry=None):
+        """Force re-encoding of a list entry, or without entry the frame."""
+        if entry is None:
+            self._frame_key = None
+        else:
+            self._dirty.add(id(entry))
+
+    def encode(self, entity):
+        """Payload of entity, encoding only changed parts."""
+        current = [_resolve(entity, path)[1] for path in self.lists]
+        key = (id(entity), tuple(bool(entries) for entries in current),
+               self._frame_fingerprint(entity, current))
+        if key != self._frame_key:
+            self._encode_frame(entity, current)
+            self._frame_key = key
+        parts = [self._frame[0]]
+        for index, path in enumerate(self.lists):
+            blocks = self._blocks[path]
+            kept = {}
+            for entry in current[index]:
+                digest = fingerprint(entry)
+                cached = blocks.get(id(entry))
+                if cached is not None and cached[1] == digest and \
+                        id(entry) not in self._dirty:
+                    block = cached[2]
+                    self.stats["reused"] += 1
+                else:
+                    if cached is not None and id(entry) not in self._dirty:
+                        logger.debug("%s changed without mark", path)
+                        self.stats["unmarked"] += 1
+                    block = self._encode_entry(entity, path, entry)
+                    self.stats["entries"] += 1
+                kept[id(entry)] = (entry, digest, block)
+                parts.append(block)
+            # forget blocks of removed entries
+            self._blocks[path] = kept
+            parts.append(self._frame[index + 1])
+        self._dirty.clear()
+        return "".join(parts)
+
+    def _frame_fingerprint(self, entity, current):
+        """Fingerprint of entity without the entries of the split lists."""
+        saved = [list(entries) for entries in current]
+        try:
+            for entries in current:
+                del entries[:]
+            return fingerprint(entity)
+        finally:
+            for entries, old_entries in zip(current, saved):
+                _replace(entries, old_entries)
+
+    def _encode_frame(self, entity, current):
+        """Encode entity with only the first entry of every split list."""
+        saved = [list(entries) for entries in current]
+        try:
+            # slices of an empty YList fail in YDK-Py 0.5
+            for entries, old_entries in zip(current, saved):
+                _replace(entries, old_entries[:1])
+            payload = self.codec.encode(self.provider, entity)
+        finally:
+            for entries, old_entries in zip(current, saved):
+                _replace(entries, old_entries)
+
+        # cut the first entry of every list out of the frame
+        cuts = []
+        for path, entries in zip(self.lists, saved):
+            if entries:
+                cuts.append(entry_block(payload, yang_name(entries[0]),
+                                        len(path.split("."))))
+            else:
+                cuts.append(None)
+        starts = [cut[0] for cut in cuts if cut]
+        if starts != sorted(starts):
+            raise ValueError("split lists must be given in payload order")
+        frame = []
+        position = 0
+        for cut in cuts:
+            start, end = cut or (position, position)
+            frame.append(payload[position:start])
+            position = end
+        frame.append(payload[position:])
+        self._frame = frame
+        self.stats["frames"] += 1
+
+    def _encode_entry(self, entity, path, entry):
+        """Encoded block of one entry in an otherwise empty object."""
+        parent = entry.parent
+        skeleton = type(entity)()
+        _resolve(skeleton, path)[1].append(entry)
+        try:
+            payload = self.codec.encode(self.provider, skeleton)
+        finally:
+            entry.parent = parent
+        start, end = entry_block(payload, yang_name(entry),
+                                 len(path.split(".")))
+        return payload[start:end]
+
+
+def add_neighbors(bgp, count, start="2001:db8::1:0", peer_group="IBGP"):
+    """Add count IBGP neighbors to bgp object; return them."""
+    neighbors = []
+    for address, _, _, _ in generate_routes(count, start, 128, None):
+        neighbor = bgp.neighbors.Neighbor()
+        neighbor.neighbor_address = address
+        neighbor.config.neighbor_address = address
+        neighbor.config.peer_group = peer_group
+        bgp.neighbors.neighbor.append(neighbor)
+        neighbors.append(neighbor)
+    return neighbors
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-v", "--verbose", help="print debugging messages",
+                        action="store_true")
+    parser.add_argument("-n", "--count", type=int, default=2000,
+                        help="number of generated neighbors")
+    parser.add_argument("-r", "--repeat", type=int, default=10,
+                        help="number of single neighbor changes")
+    parser.add_argument("app", nargs="?", default=APP,
+                        help="openconfig-bgp app with config_bgp function")
+    args = parser.parse_args()
+    enable_logging(args.verbose)
+
+    from ydk.services import CodecService
+    from ydk.providers import CodecServiceProvider
+
+    provider = CodecServiceProvider(type="xml")
+    codec = CodecService()
+    bgp = SampleApp(args.app).build()
+    neighbors = add_neighbors(bgp, args.count)
+    encoder = IncrementalEncoder(codec, provider)
+
+    start = default_timer()
+    payload = encoder.encode(bgp)
+    print("initial: {time:.3f}s, {size} bytes".format(
+        time=default_timer() - start, size=len(payload)))
+
+    full_time = incremental_time = 0.0
+    equal = True
+    for change in range(args.repeat):
+        neighbor = neighbors[change * 7919 % len(neighbors)]
+        neighbor.config.description = "change %d" % change
+        encoder.changed(neighbor)
+        start = default_timer()
+        payload = encoder.encode(bgp)
+        incremental_time += default_timer() - start
+        start = default_timer()
+        expected = codec.encode(provider, bgp)
+        full_time += default_timer() - start
+        equal = equal and payload == expected
+    print("{repeat} changes: full {full:.3f}s, incremental "
+          "{incremental:.3f}s ({speedup:.1f}x), payloads {equal}".format(
+              repeat=args.repeat, full=full_time,
+              incremental=incremental_time,
+              speedup=full_time / max(incremental_time, 1e-9),
+              equal="equal" if equal else "DIFFER"))
+    print(", ".join("%s %d" % item for item in sorted(encoder.stats.items())))
+
+    provider.close()
+    exit()
+# End of script
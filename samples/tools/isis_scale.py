@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Generate random ISIS configurations and benchmark encode/decode round trips.
+
+Random Isis objects (model Cisco-IOS-XR-clns-isis-cfg) are generated with
+the structure of the config_isis functions of the basic apps: instances
+with NETs, address families with metric styles and interfaces with
+interface address families.  Enum leafs (levels, address families,
+metric styles, interface states) take random members of their enum
+classes, list keys are unique, and the same seed gives the same object.
+
+For every size (interfaces per instance), the object is encoded with
+CodecService, decoded with stream_decode.py and encoded again.  Build,
+encode, decode and re-encode times (median of ITERATIONS), payload bytes
+and peak memory of one round trip are reported, and the round trip fails
+if the payloads differ.  With --write, the payloads are kept as a stress
+corpus (isis-SIZE-SEED.xml).
+
+usage: isis_scale.py [-h] [-v] [-s SIZES] [-i INSTANCES] [-a AFS]
+                     [-n ITERATIONS] [--seed SEED] [-w DIRECTORY]
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -v, --verbose         print debugging messages
+  -s SIZES, --sizes SIZES
+                        comma-separated interfaces per instance
+  -i INSTANCES, --instances INSTANCES
+                        ISIS instances
+  -a AFS, --afs AFS     maximum address families per instance
+  -n ITERATIONS, --iterations ITERATIONS
+                        iterations per measurement
+  --seed SEED           random seed
+  -w DIRECTORY, --write DIRECTORY
+                        write payloads to DIRECTORY
+"""
+
+from argparse import ArgumentParser
+import io
+import logging
+import os
+import random
+import sys
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from sample_app import enable_logging
+from benchmark import percentile, peak_rss, timed
+from stream_decode import decode
+
+# interface names: (format, slots per line card)
+INTERFACE_TYPES = (("GigabitEthernet0/0/%d/%d", 40),
+                   ("TenGigE0/1/%d/%d", 8),
+                   ("HundredGigE0/2/%d/%d", 4))
+
+logger = logging.getLogger("ydk.samples.isis_scale")
+
+
+def members(enum):
+    """Members of an enum class in definition order."""
+    return list(enum)
+
+
+def net_name(area, system_id):
+    """NET with area and 48-bit system ID (e.g. 49.0001.0000.0000.0001.00)."""
+    return "49.%04d.%04x.%04x.%04x.00" % (area, system_id >> 32 & 0xffff,
+                                         system_id >> 16 & 0xffff,
+                                         system_id & 0xffff)
+
+
+def interface_names(rng, count):
+    """Loopback0 followed by count - 1 unique random physical interfaces."""
+    names = ["Loopback0"]
+    used = set()
+    while len(names) < count:
+        name_format, ports = rng.choice(INTERFACE_TYPES)
+        name = name_format % (rng.randrange(8), rng.randrange(ports))
+        if name in used:
+            # fall back to a sequential port when the random one is taken
+            name = name_format % (8 + len(names) // ports,
+                                  len(names) % ports)
+        if name not in used:
+            used.add(name)
+            names.append(name)
+    return names
+
+
+def generate_isis(interfaces, instances=1, afs=2, seed=None):
+    """Random Isis object with interfaces per instance."""
+    from ydk.models.cisco_ios_xr import Cisco_IOS_XR_clns_isis_cfg \
+        as xr_clns_isis_cfg
+    from ydk.models.cisco_ios_xr import Cisco_IOS_XR_clns_isis_datatypes \
+        as xr_clns_isis_datatypes
+    from ydk.types import Empty
+
+    rng = random.Random(seed)
+    families = [(af_name, saf_name)
+                for af_name in members(
+                    xr_clns_isis_datatypes.IsisAddressFamilyEnum)
+                for saf_name in members(
+                    xr_clns_isis_datatypes.IsisSubAddressFamilyEnum)]
+    levels = members(xr_clns_isis_datatypes.IsisInternalLevelEnum)
+
+    isis = xr_clns_isis_cfg.Isis()  # create object
+    for index in range(instances):
+        instance = isis.instances.Instance()
+        instance.instance_name = "DEFAULT" if index == 0 else \
+            "ISIS-%d" % index
+        instance.running = Empty()
+        instance.is_type = rng.choice(
+            members(xr_clns_isis_cfg.IsisConfigurableLevelsEnum))
+        system_id = rng.getrandbits(48)
+        for area in sorted(rng.sample(range(10000), rng.randint(1, 3))):
+            net = instance.nets.Net()
+            net.net_name = net_name(area, system_id)
+            instance.nets.net.append(net)
+
+        # address families with metric styles for random levels
+        instance_families = rng.sample(families,
+                                       rng.randint(1, min(afs,
+                                                          len(families))))
+        for af_name, saf_name in instance_families:
+            af = instance.afs.Af()
+            af.af_name = af_name
+            af.saf_name = saf_name
+            af.af_data = af.AfData()
+            for level in rng.sample(levels, rng.randint(1, len(levels))):
+                metric_style = af.af_data.metric_styles.MetricStyle()
+                metric_style.style = rng.choice(
+                    members(xr_clns_isis_cfg.IsisMetricStyleEnum))
+                metric_style.level = level
+                metric_style.transition_state = rng.choice(
+                    members(xr_clns_isis_cfg.IsisMetricStyleTransitionEnum))
+                af.af_data.metric_styles.metric_style.append(metric_style)
+            instance.afs.af.append(af)
+
+        # interfaces with a subset of the instance address families
+        for name in interface_names(rng, interfaces):
+            interface = instance.interfaces.Interface()
+            interface.interface_name = name
+            interface.running = Empty()
+            if name.startswith("Loopback"):
+                interface.state = \
+                    xr_clns_isis_cfg.IsisInterfaceStateEnum.passive
+            elif rng.random() < 0.5:
+                interface.point_to_point = Empty()
+            else:
+                interface.state = rng.choice(
+                    members(xr_clns_isis_cfg.IsisInterfaceStateEnum))
+            for af_name, saf_name in rng.sample(
+                    instance_families,
+                    rng.randint(1, len(instance_families))):
+                interface_af = interface.interface_afs.InterfaceAf()
+                interface_af.af_name = af_name
+                interface_af.saf_name = saf_name
+                interface_af.interface_af_data.running = Empty()
+                interface.interface_afs.interface_af.append(interface_af)
+            instance.interfaces.interface.append(interface)
+        isis.instances.instance.append(instance)
+    return isis
+
+
+def round_trip(codec, provider, isis):
+    """Encode, decode and re-encode isis; return both payloads."""
+    payload = codec.encode(provider, isis)
+    decoded = decode(io.BytesIO(payload.encode("utf-8")), type(isis))
+    return payload, codec.encode(provider, decoded)
+
+
+def peak_memory(function):
+    """Peak memory allocated by function in kilobytes.
+
+    Uses tracemalloc where available and the peak RSS of the process
+    otherwise (which never decreases between calls).
+    """
+    if tracemalloc is None:
+        function()
+        return peak_rss()
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1] // 1024
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark_size(codec, provider, interfaces, instances, afs, iterations,
+                   seed):
+    """Measurements of one object size; return dict and payload."""
+    samples, isis = timed(lambda: generate_isis(interfaces, instances, afs,
+                                                seed), iterations)
+    result = {"build": percentile(samples, 50)}
+    samples, payload = timed(lambda: codec.encode(provider, isis),
+                             iterations)
+    result["encode"] = percentile(samples, 50)
+    result["bytes"] = len(payload)
+    samples, decoded = timed(
+        lambda: decode(io.BytesIO(payload.encode("utf-8")), type(isis)),
+        iterations)
+    result["decode"] = percentile(samples, 50)
+    samples, again = timed(lambda: codec.encode(provider, decoded),
+                           iterations)
+    result["reencode"] = percentile(samples, 50)
+    result["equal"] = payload == again
+    result["peak_kb"] = peak_memory(lambda: round_trip(codec, provider,
+                                                       isis))
+    return result, payload
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-v", "--verbose", help="print debugging messages",
+                        action="store_true")
+    parser.add_argument("-s", "--sizes", default="1,10,100,1000",
+                        help="comma-separated interfaces per instance")
+    parser.add_argument("-i", "--instances", type=int, default=1,
+                        help="ISIS instances")
+    parser.add_argument("-a", "--afs", type=int, default=2,
+                        help="maximum address families per instance")
+    parser.add_argument("-n", "--iterations", type=int, default=3,
+                        help="iterations per measurement")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("-w", "--write", metavar="DIRECTORY",
+                        help="write payloads to DIRECTORY")
+    args = parser.parse_args()
+    enable_logging(args.verbose)
+
+    from ydk.services import CodecService
+    from ydk.providers import CodecServiceProvider
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    if args.write and not os.path.isdir(args.write):
+        os.makedirs(args.write)
+    provider = CodecServiceProvider(type="xml")
+    codec = CodecService()
+
+    print("{:>7} {:>10} {:>9} {:>9} {:>9} {:>9} {:>9}  {}".format(
+        "size", "bytes", "build", "encode", "decode", "reencode", "peak KB",
+        "round trip"))
+    failed = False
+    for size in sizes:
+        result, payload = benchmark_size(codec, provider, size,
+                                         args.instances, args.afs,
+                                         args.iterations, args.seed)
+        failed = failed or not result["equal"]
+        print("{size:>7} {bytes:>10} {build:>9.4f} {encode:>9.4f} "
+              "{decode:>9.4f} {reencode:>9.4f} {peak_kb:>9}  {status}".format(
+                  size=size, status="ok" if result["equal"] else "DIFFER",
+                  **result))
+        if args.write:
+            path = os.path.join(args.write, "isis-%d-%d.xml" % (size,
+                                                               args.seed))
+            with open(path, "w") as output:
+                output.write(payload)
+
+    provider.close()
+    sys.exit(1 if failed else 0)
+# End of script
@@ -0,0 +1,314 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Encode configuration of codec apps as JSON (RFC 7951).
+
+The CodecServiceProvider of YDK-Py 0.5 only encodes XML, so model objects
+are encoded here from their meta information: YANG names, module-qualified
+top-level and cross-module members, lists as arrays, empty leafs as [null],
+64-bit integers and decimal64 values as strings, enums by YANG name and
+identities as module:identity.  By default the object built by each app is
+printed as JSON.  With --fixtures, a -ydk.json file is written next to every
+-ydk.xml fixture that the XML encoding of the app object matches (see
+verify_fixtures.py).  With --compare, encode time and payload bytes of XML and
+JSON are reported for every app and model.
+
+usage: json_codec.py [-h] [-v] [-i INDENT] [--fixtures] [--compare]
+                     [-n ITERATIONS]
+                     [path [path ...]]
+
+positional arguments:
+  path                  app file or directory (default: samples/basic/codec)
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -v, --verbose         print debugging messages
+  -i INDENT, --indent INDENT
+                        JSON indentation (default: compact)
+  --fixtures            write JSON fixtures next to XML fixtures
+  --compare             compare XML and JSON encode time and bytes
+  -n ITERATIONS, --iterations ITERATIONS
+                        iterations per measurement
+"""
+
+from argparse import ArgumentParser
+from collections import OrderedDict
+import json
+import logging
+import os
+import re
+
+from sample_app import find_apps, enable_logging
+from entity_tree import is_identity, list_item, members, CONTAINER, LIST
+from benchmark import timed, percentile
+from verify_fixtures import canonical
+
+SAMPLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..",
+                       "basic", "codec")
+
+# integers outside this range are int64/uint64 and encoded as strings
+_INT32_MIN = -2 ** 31
+_UINT32_MAX = 2 ** 32 - 1
+
+try:
+    _INTEGER_TYPES = (int, long)
+except NameError:
+    _INTEGER_TYPES = (int,)
+
+logger = logging.getLogger("ydk.samples.json_codec")
+
+
+def _yang_name(name):
+    """YANG name guessed from a Python name (global_ -> global)."""
+    return name.rstrip("_").replace("_", "-")
+
+
+def _class_yang_name(cls):
+    """YANG name guessed from a class name (PeerVrf -> peer-vrf)."""
+    return re.sub(r"(?<!^)([A-Z])", r"-\1", cls.__name__).lower()
+
+
+def _class_meta(entity):
+    try:
+        return entity._meta_info()
+    except (AttributeError, TypeError):
+        return None
+
+
+def _member_meta(entity):
+    """Member meta information of entity by Python attribute name."""
+    meta = _class_meta(entity)
+    try:
+        return dict((member.presentation_name, member)
+                    for member in meta.meta_info_class_members)
+    except AttributeError:
+        return {}
+
+
+def _module(entity):
+    meta = _class_meta(entity)
+    return getattr(meta, "module_name", None)
+
+
+def _is_int64(member):
+    """Whether the range of an integer member exceeds 32 bits."""
+    if getattr(member, "ptype", None) not in ("int", "long"):
+        return False
+    # YDK-Py 0.5 keeps the range of a member as private _range
+    for bounds in getattr(member, "_range", None) or []:
+        for bound in bounds:
+            try:
+                if not _INT32_MIN <= int(bound) <= _UINT32_MAX:
+                    return True
+            except (TypeError, ValueError):
+                pass
+    return False
+
+
+def json_value(value, member=None):
+    """RFC 7951 representation of a leaf value."""
+    if type(value).__name__ == "Empty":
+        return [None]
+    if isinstance(value, bool):
+        return value
+    if hasattr(value, "name") and hasattr(type(value), "__members__"):
+        return _enum_name(value)
+    if is_identity(value):
+        meta = _class_meta(value)
+        name = getattr(meta, "yang_name", None) or \
+            _class_yang_name(type(value))[:-len("-identity")].upper()
+        module = getattr(meta, "module_name", None)
+        return "%s:%s" % (module, name) if module else name
+    if isinstance(value, _INTEGER_TYPES):
+        if _is_int64(member) or not _INT32_MIN <= value <= _UINT32_MAX:
+            return str(value)
+        return value
+    if type(value).__name__ == "Decimal64":
+        return str(getattr(value, "s", value))
+    return str(value)
+
+
+def _enum_name(value):
+    """YANG name of an enum value."""
+    try:
+        literals = type(value)._meta_info().literal_map
+        for yang_name, python_name in literals.items():
+            if python_name == value.name:
+                return yang_name
+    except (AttributeError, TypeError):
+        pass
+    return _yang_name(value.name)
+
+
+def to_json(entity, module=None):
+    """RFC 7951 JSON object (OrderedDict) of an entity's contents."""
+    result = OrderedDict()
+    meta = _member_meta(entity)
+    for name, value, kind in members(entity):
+        member = meta.get(name)
+        yang_name = getattr(member, "name", None) or _yang_name(name)
+        member_module = getattr(member, "module_name", None) or module
+        if member_module and member_module != module:
+            yang_name = "%s:%s" % (member_module, yang_name)
+        if kind == CONTAINER:
+            child = to_json(value, member_module)
+            if child:
+                result[yang_name] = child
+        elif kind == LIST:
+            entries = [to_json(entry, member_module) for entry in value]
+            if entries:
+                result[yang_name] = entries
+        elif isinstance(value, list):
+            if value:
+                result[yang_name] = [json_value(list_item(v), member)
+                                     for v in value]
+        elif value is not None:
+            result[yang_name] = json_value(value, member)
+    return result
+
+
+def encode_json(entity, indent=None):
+    """Encode top-level model object as RFC 7951 JSON text."""
+    meta = _class_meta(entity)
+    module = _module(entity)
+    name = getattr(meta, "yang_name", None) or _class_yang_name(type(entity))
+    document = OrderedDict()
+    document["%s:%s" % (module, name) if module else name] = \
+        to_json(entity, module)
+    separators = (",", ": ") if indent else (",", ":")
+    return json.dumps(document, indent=indent, separators=separators)
+
+
+def write_fixture(app, indent=2, codec=None, codec_provider=None):
+    """Write JSON fixture of app next to its XML fixture; return path.
+
+    With a codec, the fixture is only written if the XML encoding of the
+    object matches the XML fixture (None is returned otherwise), so both
+    fixtures describe the same configuration for the installed models.
+    """
+    xml_fixture = app.fixture(".xml")
+    if xml_fixture is None:
+        return None
+    obj = app.call_argument(app.build())
+    if codec is not None:
+        with open(xml_fixture, "rb") as fixture:
+            expected = fixture.read()
+        if canonical(codec.encode(codec_provider, obj)) != \
+                canonical(expected):
+            logger.info("Skipping %s: XML fixture does not match",
+                        app.name)
+            return None
+    path = app.path[:-3] + ".json"
+    payload = encode_json(obj, indent)
+    with open(path, "w") as fixture:
+        fixture.write(payload + "\n")
+    return path
+
+
+def compare(apps, iterations, codec_provider):
+    """Yield (model, app name, xml time, xml bytes, json time, json bytes).
+
+    Times are median encode times in seconds.
+    """
+    from ydk.services import CodecService
+
+    codec = CodecService()
+    for app in apps:
+        try:
+            obj = app.call_argument(app.build())
+            samples, xml = timed(lambda: codec.encode(codec_provider, obj),
+                                 iterations)
+            xml_time = percentile(samples, 50)
+            samples, payload = timed(lambda: encode_json(obj), iterations)
+        except Exception as error:
+            logger.info("Skipping %s: %s", app.name, error)
+            continue
+        yield (os.path.basename(os.path.dirname(app.path)), app.name,
+               xml_time, len(xml.encode("utf-8")), percentile(samples, 50),
+               len(payload.encode("utf-8")))
+
+
+def print_comparison(rows):
+    """Print per app comparison and per model totals."""
+    line = "{:<46} {:>10} {:>8} {:>10} {:>8} {:>6}"
+    print(line.format("app", "xml (ms)", "xml (B)", "json (ms)", "json (B)",
+                      "json %"))
+    totals = OrderedDict()
+    for model, name, xml_time, xml_bytes, json_time, json_bytes in rows:
+        print("{:<46} {:>10.3f} {:>8} {:>10.3f} {:>8} {:>6.0f}".format(
+            name[:46], 1e3 * xml_time, xml_bytes, 1e3 * json_time,
+            json_bytes, 100.0 * json_bytes / xml_bytes))
+        total = totals.setdefault(model, [0.0, 0, 0.0, 0])
+        for index, value in enumerate((xml_time, xml_bytes, json_time,
+                                       json_bytes)):
+            total[index] += value
+    print("")
+    print(line.format("model", "xml (ms)", "xml (B)", "json (ms)",
+                      "json (B)", "json %"))
+    for model, (xml_time, xml_bytes, json_time, json_bytes) in \
+            totals.items():
+        print("{:<46} {:>10.3f} {:>8} {:>10.3f} {:>8} {:>6.0f}".format(
+            model[:46], 1e3 * xml_time, xml_bytes, 1e3 * json_time,
+            json_bytes, 100.0 * json_bytes / xml_bytes))
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-v", "--verbose", help="print debugging messages",
+                        action="store_true")
+    parser.add_argument("-i", "--indent", type=int,
+                        help="JSON indentation (default: compact)")
+    parser.add_argument("--fixtures", action="store_true",
+                        help="write JSON fixtures next to XML fixtures")
+    parser.add_argument("--compare", action="store_true",
+                        help="compare XML and JSON encode time and bytes")
+    parser.add_argument("-n", "--iterations", type=int, default=100,
+                        help="iterations per measurement")
+    parser.add_argument("path", nargs="*", default=[SAMPLES],
+                        help="app file or directory (default: "
+                             "samples/basic/codec)")
+    args = parser.parse_args()
+    enable_logging(args.verbose)
+
+    apps = find_apps(args.path, prefix="cd-encode")
+    if args.compare:
+        from ydk.providers import CodecServiceProvider
+        provider = CodecServiceProvider(type="xml")
+        print_comparison(compare(apps, args.iterations, provider))
+        provider.close()
+    elif args.fixtures:
+        from ydk.services import CodecService
+        from ydk.providers import CodecServiceProvider
+        provider = CodecServiceProvider(type="xml")
+        codec = CodecService()
+        for app in apps:
+            try:
+                path = write_fixture(app, args.indent or 2, codec, provider)
+            except Exception as error:
+                logger.info("Skipping %s: %s", app.name, error)
+                continue
+            if path:
+                print(path)
+        provider.close()
+    else:
+        for app in apps:
+            print(encode_json(app.call_argument(app.build()), args.indent))
+
+    exit()
+# End of script
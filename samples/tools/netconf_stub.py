@@ -0,0 +1,733 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Local NETCONF-over-SSH stub device for offline runs and benchmarks.
+
+The stub seeds its running datastore with the XML data files of the basic
+apps (nc-create-*-ydk.xml), advertises those models and the RPC models of
+the nc-execute apps as capabilities and answers edit-config, get-config,
+get (including the ietf-netconf-monitoring schema list) and RPC requests
+(e.g. Cisco-IOS-XR-snmp-test-trap-act, Cisco-IOS-XR-cfgmgr-rollback-act,
+Cisco-IOS-XR-syslog-act and ietf-netconf-monitoring get-schema).  Every
+reply can be delayed by a configurable latency and jitter, like on a
+network link: requests are processed as they arrive and replies are sent
+in order, each one LATENCY after its request, so pipelined requests
+overlap their delays.  With --syslog, the message of every
+Cisco-IOS-XR-syslog-act logmsg RPC is sent as a syslog datagram to
+HOST:PORT, like a device logging to a remote host.  Any username and
+password are accepted.  Requires paramiko (a dependency of YDK-Py).
+
+usage: netconf_stub.py [-h] [-v] [-a ADDRESS] [-p PORT] [-l LATENCY]
+                       [-j JITTER] [-d DATA] [-s SCHEMAS] [-k HOST_KEY]
+                       [--syslog HOST:PORT]
+                       [fixtures [fixtures ...]]
+
+positional arguments:
+  fixtures              app XML data files or directories to load
+                        (default: all nc-create and nc-execute apps in
+                        samples/basic)
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -v, --verbose         print debugging messages
+  -a ADDRESS, --address ADDRESS
+                        address to listen on
+  -p PORT, --port PORT  port to listen on
+  -l LATENCY, --latency LATENCY
+                        reply latency in milliseconds
+  -j JITTER, --jitter JITTER
+                        reply jitter in milliseconds
+  -d DATA, --data DATA  XML document whose top-level children are served
+                        as operational data by get
+  -s SCHEMAS, --schemas SCHEMAS
+                        directory with YANG modules served by get-schema
+  -k HOST_KEY, --host-key HOST_KEY
+                        SSH host key file (default: generated)
+  --syslog HOST:PORT    send logmsg RPC messages to this syslog receiver
+"""
+
+from argparse import ArgumentParser
+from functools import reduce
+import copy
+import importlib
+import logging
+import os
+import random
+import re
+import socket
+import threading
+import time
+import xml.etree.ElementTree as etree
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from sample_app import enable_logging
+
+BASE_NS = "urn:ietf:params:xml:ns:netconf:base:1.0"
+MONITORING_NS = "urn:ietf:params:xml:ns:yang:ietf-netconf-monitoring"
+BASE_10 = "urn:ietf:params:netconf:base:1.0"
+BASE_11 = "urn:ietf:params:netconf:base:1.1"
+SYSLOG_ACT_NS = "http://cisco.com/ns/yang/Cisco-IOS-XR-syslog-act"
+EOM = b"]]>]]>"
+
+# ietf-syslog-types severities by syslog severity code
+SEVERITIES = ("emergency", "alert", "critical", "error", "warning",
+              "notice", "info", "debug")
+
+SAMPLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..",
+                       "basic")
+
+logger = logging.getLogger("ydk.samples.netconf_stub")
+
+
+def qname(namespace, tag):
+    """Clark notation name used by ElementTree."""
+    return "{%s}%s" % (namespace, tag)
+
+
+def split_qname(name):
+    """Split Clark notation name into namespace and local name."""
+    if name.startswith("{"):
+        namespace, tag = name[1:].split("}", 1)
+        return namespace, tag
+    return None, name
+
+
+def _operation(element):
+    """Value of the NETCONF operation attribute (or None)."""
+    return (element.get(qname(BASE_NS, "operation")) or
+            element.get("operation"))
+
+
+def _entry_key(element, keys):
+    """Identify a child for merging: tag, plus key values for list entries.
+
+    keys are the local names of the key leafs of a list entry; containers
+    (no keys) are identified by their tag alone.
+    """
+    if not keys:
+        return element.tag,
+    values = dict((split_qname(child.tag)[1], (child.text or "").strip())
+                  for child in element if len(child) == 0)
+    return (element.tag,) + tuple(values.get(key) for key in keys)
+
+
+def _leading_leafs(element):
+    """Local names of the leafs before the first container of element."""
+    names = []
+    for child in element:
+        if len(child):
+            break
+        names.append(split_qname(child.tag)[1])
+    return tuple(names)
+
+
+def _model_meta(element):
+    """YDK meta information of a top-level element (None if unknown)."""
+    try:
+        from ydk.providers._importer import _yang_ns
+    except ImportError:
+        return None
+    statement = _yang_ns._namespace_package_map.get(split_qname(element.tag))
+    if statement is None:
+        return None
+    # from ydk.models.<bundle>.<module> import <class>
+    words = statement.split()
+    return getattr(importlib.import_module(words[1]), words[-1])._meta_info()
+
+
+def _child_schema(meta, element):
+    """Meta information and key names of a child element of meta's class.
+
+    Key names are None for containers.  None is returned for leafs and
+    elements the model does not know.
+    """
+    from ydk._core._dm_meta_info import REFERENCE_CLASS, REFERENCE_LIST
+
+    name = split_qname(element.tag)[1]
+    for member in meta.meta_info_class_members:
+        if member.name == name and \
+                member.mtype in (REFERENCE_CLASS, REFERENCE_LIST):
+            cls = reduce(getattr, member.clazz_name.split("."),
+                         importlib.import_module(member.pmodule_name))
+            child_meta = cls._meta_info()
+            if member.mtype == REFERENCE_CLASS:
+                return child_meta, None
+            return child_meta, tuple(key.name for key
+                                     in child_meta.key_members())
+    return None
+
+
+def _clean(element):
+    """Copy of edit-config element without delete or operation markers."""
+    element = copy.deepcopy(element)
+    for node in list(element.iter()):
+        for child in list(node):
+            if _operation(child) in ("delete", "remove"):
+                node.remove(child)
+        for name in list(node.attrib):
+            if split_qname(name)[1] == "operation":
+                del node.attrib[name]
+    return element
+
+
+class Datastore(object):
+    """Thread-safe XML datastore with merge, delete and subtree filter."""
+
+    def __init__(self):
+        self.root = etree.Element("data")
+        self.modules = {}    # namespace -> module name
+        self.list_tags = set()    # tags seen repeated as siblings
+        self.key_names = {}    # list tag -> learned key leaf names
+        self._lock = threading.Lock()
+
+    def load_fixture(self, path):
+        """Register model of app data file and merge its configuration.
+
+        Data files of nc-execute apps hold RPC input, so only their model
+        is registered.
+        """
+        element = etree.parse(path).getroot()
+        namespace, _ = split_qname(element.tag)
+        module = os.path.basename(os.path.dirname(os.path.abspath(path)))
+        self.modules.setdefault(namespace, module)
+        if not os.path.basename(path).startswith("nc-execute-"):
+            self.edit([element])
+
+    def edit(self, elements):
+        """Apply edit-config elements (merge, replace, create, delete)."""
+        with self._lock:
+            for element in elements:
+                self._learn_lists(element)
+                # top-level elements are containers
+                self._edit(self.root, element, (_model_meta(element), None))
+
+    def get(self, filters=None):
+        """Return copy of datastore, restricted by subtree filters."""
+        with self._lock:
+            data = etree.Element(qname(BASE_NS, "data"))
+            for element in self.root:
+                if filters is None:
+                    data.append(copy.deepcopy(element))
+                    continue
+                for filter_element in filters:
+                    selected = self._filter(element, filter_element)
+                    if selected is not None:
+                        data.append(selected)
+            return data
+
+    def _learn_lists(self, element):
+        """Record tags that repeat among siblings as list entry tags."""
+        for node in element.iter():
+            seen = set()
+            for child in node:
+                if child.tag in seen:
+                    self.list_tags.add(child.tag)
+                seen.add(child.tag)
+
+    def _is_list(self, parent, element):
+        """Whether element is a list entry (repeated or plural parent)."""
+        if element.tag in self.list_tags:
+            return True
+        # e.g. interface-configurations/interface-configuration
+        name = split_qname(element.tag)[1]
+        return split_qname(parent.tag)[1] in (name + "s", name + "es")
+
+    def _keys(self, parent, element):
+        """Learned key names of element if it is a list entry, else None.
+
+        YDK encodes the keys of a list entry as its first leafs, so without
+        the model the keys are the leading leafs that all entries of the
+        list seen so far share.
+        """
+        if not self._is_list(parent, element):
+            return None
+        leading = _leading_leafs(element)
+        known = self.key_names.get(element.tag, leading)
+        common = []
+        for name, known_name in zip(leading, known):
+            if name != known_name:
+                break
+            common.append(name)
+        keys = tuple(common) or leading[:1]
+        self.key_names[element.tag] = keys
+        return keys
+
+    def _edit(self, parent, element, schema=None):
+        """Merge element into parent.
+
+        schema is the YDK meta information and key names of element (see
+        _child_schema), or None to learn list keys from the data.
+        """
+        operation = _operation(element)
+        if schema is not None:
+            meta, keys = schema
+        else:
+            meta, keys = None, self._keys(parent, element)
+        key = _entry_key(element, keys)
+        existing = None
+        for child in parent:
+            if _entry_key(child, keys) == key:
+                existing = child
+                break
+        if operation in ("delete", "remove"):
+            if existing is not None:
+                parent.remove(existing)
+            return
+        if existing is None or operation == "replace" or len(element) == 0:
+            if existing is not None:
+                parent.remove(existing)
+            parent.append(_clean(element))
+            return
+        for child in element:
+            self._edit(existing, child, _child_schema(meta, child)
+                       if meta is not None else None)
+
+    def _filter(self, data, selector):
+        """RFC 6241 subtree filtering of data by selector element."""
+        if data.tag != selector.tag:
+            return None
+        children = list(selector)
+        text = (selector.text or "").strip()
+        if text:
+            return data if (data.text or "").strip() == text else None
+        if not children:
+            return copy.deepcopy(data)
+        matches = [c for c in children if len(c) == 0 and
+                   (c.text or "").strip()]
+        for match in matches:
+            if not any(self._filter(d, match) is not None
+                       for d in data.findall(match.tag)):
+                return None
+        if len(matches) == len(children):
+            return copy.deepcopy(data)
+        result = etree.Element(data.tag, data.attrib)
+        for child in data:
+            for selection in children:
+                selected = self._filter(child, selection)
+                if selected is not None:
+                    result.append(copy.deepcopy(selected))
+                    break
+        return result if len(result) else None
+
+
+def _rpc_error(attributes, tag, message):
+    """rpc-reply with an rpc-error (RFC 6241 appendix A)."""
+    reply = etree.Element(qname(BASE_NS, "rpc-reply"), attributes)
+    error = etree.SubElement(reply, qname(BASE_NS, "rpc-error"))
+    etree.SubElement(error, qname(BASE_NS, "error-type")).text = \
+        "rpc" if tag == "malformed-message" else "application"
+    etree.SubElement(error, qname(BASE_NS, "error-tag")).text = tag
+    etree.SubElement(error, qname(BASE_NS, "error-severity")).text = "error"
+    etree.SubElement(error, qname(BASE_NS, "error-message")).text = \
+        str(message)
+    return etree.tostring(reply)
+
+
+class NetconfHandler(object):
+    """NETCONF protocol operations for one session."""
+
+    def __init__(self, datastore, session_id, oper=None, schemas=None,
+                 syslog=None):
+        self.datastore = datastore
+        self.session_id = session_id
+        self.oper = oper
+        self.schemas = schemas
+        self.syslog = syslog
+        self.closed = False
+
+    def hello(self):
+        """Server hello with base and model capabilities."""
+        hello = etree.Element(qname(BASE_NS, "hello"))
+        capabilities = etree.SubElement(hello, qname(BASE_NS,
+                                                     "capabilities"))
+        names = [BASE_10, BASE_11,
+                 "urn:ietf:params:netconf:capability:candidate:1.0",
+                 "urn:ietf:params:netconf:capability:rollback-on-error:1.0",
+                 "urn:ietf:params:netconf:capability:validate:1.1"]
+        names.extend("%s?module=%s" % item
+                     for item in sorted(self.datastore.modules.items()))
+        for name in names:
+            etree.SubElement(capabilities, qname(BASE_NS,
+                                                 "capability")).text = name
+        etree.SubElement(hello, qname(BASE_NS, "session-id")).text = \
+            str(self.session_id)
+        return etree.tostring(hello)
+
+    def handle(self, message):
+        """Process one rpc message and return the rpc-reply.
+
+        Malformed messages and failing operations are answered with an
+        rpc-error, so the session goes on.
+        """
+        try:
+            rpc = etree.fromstring(message)
+        except etree.ParseError as error:
+            return _rpc_error({}, "malformed-message", error)
+        if rpc.tag != qname(BASE_NS, "rpc") or len(rpc) == 0:
+            return _rpc_error(rpc.attrib, "malformed-message",
+                              "rpc element with one operation expected")
+        try:
+            return self._dispatch(rpc)
+        except Exception as error:
+            logger.debug("Session %s: %s failed: %s", self.session_id,
+                         rpc[0].tag, error)
+            return _rpc_error(rpc.attrib, "operation-failed", error)
+
+    def _dispatch(self, rpc):
+        reply = etree.Element(qname(BASE_NS, "rpc-reply"), rpc.attrib)
+        operation = rpc[0]
+        namespace, name = split_qname(operation.tag)
+        logger.debug("Session %s: %s %s", self.session_id, namespace, name)
+        if namespace == BASE_NS and name in ("get", "get-config"):
+            reply.append(self._get(operation, name == "get"))
+        elif namespace == BASE_NS and name == "edit-config":
+            config = operation.find(qname(BASE_NS, "config"))
+            self.datastore.edit(list(config) if config is not None else [])
+            etree.SubElement(reply, qname(BASE_NS, "ok"))
+        elif namespace == MONITORING_NS and name == "get-schema":
+            data = etree.SubElement(reply, qname(MONITORING_NS, "data"))
+            data.text = self._schema(operation)
+        elif namespace == SYSLOG_ACT_NS and name == "logmsg":
+            if self.syslog is not None:
+                self.syslog.send(
+                    operation.findtext(qname(SYSLOG_ACT_NS, "severity")),
+                    operation.findtext(qname(SYSLOG_ACT_NS, "message")))
+            etree.SubElement(reply, qname(BASE_NS, "ok"))
+        else:
+            # close-session, lock, commit and model RPCs are acknowledged
+            self.closed = namespace == BASE_NS and name in ("close-session",
+                                                            "kill-session")
+            etree.SubElement(reply, qname(BASE_NS, "ok"))
+        return etree.tostring(reply)
+
+    def _get(self, operation, include_oper):
+        filter_element = operation.find(qname(BASE_NS, "filter"))
+        filters = list(filter_element) if filter_element is not None else None
+        data = self.datastore.get(filters)
+        if include_oper:
+            state = self._netconf_state()
+            for selector in filters if filters is not None else [None]:
+                selected = (state if selector is None else
+                            self.datastore._filter(state, selector))
+                if selected is not None:
+                    data.append(selected)
+        if include_oper and self.oper is not None:
+            for element in self.oper.get(filters):
+                data.append(element)
+        return data
+
+    def _netconf_state(self):
+        """ietf-netconf-monitoring schema list of the stub."""
+        state = etree.Element(qname(MONITORING_NS, "netconf-state"))
+        schemas = etree.SubElement(state, qname(MONITORING_NS, "schemas"))
+        if self.schemas:
+            names = sorted(name[:-5].partition("@")
+                           for name in os.listdir(self.schemas)
+                           if name.endswith(".yang"))
+            modules = [(identifier, version, None)
+                       for identifier, _, version in names]
+        else:
+            modules = sorted((module, "", namespace) for namespace, module
+                             in self.datastore.modules.items())
+        for identifier, version, namespace in modules:
+            schema = etree.SubElement(schemas, qname(MONITORING_NS,
+                                                     "schema"))
+            for name, value in (("identifier", identifier),
+                                ("version", version), ("format", "yang"),
+                                ("namespace", namespace),
+                                ("location", "NETCONF")):
+                if value is not None:
+                    etree.SubElement(schema, qname(MONITORING_NS,
+                                                   name)).text = value
+        return state
+
+    def _schema(self, operation):
+        identifier = operation.findtext(qname(MONITORING_NS, "identifier"))
+        version = operation.findtext(qname(MONITORING_NS, "version"))
+        if self.schemas:
+            for name in ("%s@%s.yang" % (identifier, version),
+                         "%s.yang" % identifier):
+                path = os.path.join(self.schemas, name)
+                if os.path.exists(path):
+                    with open(path) as schema:
+                        return schema.read()
+        return "module %s {\n  // stub schema revision %s\n}\n" % (
+            identifier, version)
+
+
+class Framing(object):
+    """NETCONF 1.0 (end-of-message) and 1.1 (chunked) message framing."""
+
+    _CHUNK = re.compile(br"\n#(\d+)\n")
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.chunked = False
+        self._buffer = b""
+
+    def send(self, message):
+        if self.chunked:
+            data = b"\n#%d\n" % len(message) + message + b"\n##\n"
+        else:
+            data = message + EOM
+        self.channel.sendall(data)
+
+    def receive(self):
+        """Return next message or None when the peer closes the session."""
+        while True:
+            message = (self._chunked_message() if self.chunked
+                       else self._eom_message())
+            if message is not None:
+                return message
+            data = self.channel.recv(65536)
+            if not data:
+                return None
+            self._buffer += data
+
+    def _eom_message(self):
+        end = self._buffer.find(EOM)
+        if end < 0:
+            return None
+        message, self._buffer = self._buffer[:end], self._buffer[end + 6:]
+        return message
+
+    def _chunked_message(self):
+        chunks = []
+        position = 0
+        while True:
+            if self._buffer.startswith(b"\n##\n", position):
+                self._buffer = self._buffer[position + 4:]
+                return b"".join(chunks)
+            match = self._CHUNK.match(self._buffer, position)
+            if not match:
+                return None
+            start = match.end()
+            end = start + int(match.group(1))
+            if len(self._buffer) < end:
+                return None
+            chunks.append(self._buffer[start:end])
+            position = end
+
+
+class SyslogRelay(object):
+    """Sends messages as BSD syslog datagrams (facility local7)."""
+
+    def __init__(self, address, port=514):
+        self.address = (address, port)
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._hostname = socket.gethostname()
+
+    def send(self, severity, message):
+        try:
+            code = SEVERITIES.index((severity or "").strip())
+        except ValueError:
+            code = SEVERITIES.index("notice")
+        datagram = "<%d>%s %s logger: %s" % (
+            23 * 8 + code, time.strftime("%b %d %H:%M:%S"), self._hostname,
+            (message or "").strip())
+        self._socket.sendto(datagram.encode("utf-8"), self.address)
+
+
+class StubDevice(object):
+    """NETCONF-over-SSH stub device."""
+
+    def __init__(self, datastore, latency=0.0, jitter=0.0, oper=None,
+                 schemas=None, host_key=None, syslog=None):
+        import paramiko
+
+        self.datastore = datastore
+        self.latency = latency
+        self.jitter = jitter
+        self.oper = oper
+        self.schemas = schemas
+        self.syslog = syslog
+        if host_key:
+            self.host_key = paramiko.RSAKey.from_private_key_file(host_key)
+        else:
+            self.host_key = paramiko.RSAKey.generate(2048)
+        self._sessions = 0
+        self._lock = threading.Lock()
+
+    def delay(self):
+        """Reply delay: latency plus uniform jitter (seconds)."""
+        return max(0.0, self.latency + random.uniform(-self.jitter,
+                                                      self.jitter))
+
+    def serve(self, address="127.0.0.1", port=8300):
+        """Accept SSH connections forever."""
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind((address, port))
+        listener.listen(128)
+        logger.info("Listening on %s:%s", address, port)
+        while True:
+            client, peer = listener.accept()
+            thread = threading.Thread(target=self._connection,
+                                      args=(client, peer))
+            thread.daemon = True
+            thread.start()
+
+    def _connection(self, client, peer):
+        import paramiko
+
+        class Server(paramiko.ServerInterface):
+            def check_auth_password(self, username, password):
+                return paramiko.AUTH_SUCCESSFUL
+
+            def get_allowed_auths(self, username):
+                return "password"
+
+            def check_channel_request(self, kind, chanid):
+                if kind == "session":
+                    return paramiko.OPEN_SUCCEEDED
+                return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+            def check_channel_subsystem_request(self, channel, name):
+                channel.netconf = name == "netconf"
+                subsystem.set()
+                return channel.netconf
+
+        subsystem = threading.Event()
+        transport = paramiko.Transport(client)
+        transport.add_server_key(self.host_key)
+        try:
+            transport.start_server(server=Server())
+            channel = transport.accept(30)
+            if channel is None or not subsystem.wait(30):
+                return
+            with self._lock:
+                self._sessions += 1
+                session_id = self._sessions
+            logger.debug("Session %s from %s:%s", session_id, *peer)
+            self._session(channel, session_id)
+        except Exception as error:
+            logger.debug("Connection from %s:%s failed: %s", peer[0],
+                         peer[1], error)
+        finally:
+            transport.close()
+
+    def _session(self, channel, session_id):
+        handler = NetconfHandler(self.datastore, session_id, self.oper,
+                                 self.schemas, self.syslog)
+        framing = Framing(channel)
+        framing.send(handler.hello())
+        client_hello = framing.receive()
+        if client_hello is None:
+            return
+        framing.chunked = BASE_11.encode() in client_hello
+        replies = queue.Queue()
+        sender = threading.Thread(target=self._send_replies,
+                                  args=(framing, replies))
+        sender.daemon = True
+        sender.start()
+        while not handler.closed:
+            message = framing.receive()
+            if message is None:
+                break
+            replies.put((time.time() + self.delay(),
+                         handler.handle(message)))
+        replies.put(None)
+        sender.join()
+
+    def _send_replies(self, framing, replies):
+        """Send replies in order, each at its due time."""
+        while True:
+            item = replies.get()
+            if item is None:
+                return
+            due, reply = item
+            delay = due - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            framing.send(reply)
+
+
+def load_datastore(paths):
+    """Create datastore from app XML data files found in paths."""
+    datastore = Datastore()
+    for path in paths:
+        if os.path.isfile(path):
+            files = [path]
+        else:
+            files = sorted(os.path.join(d, f) for d, _, names in os.walk(path)
+                           for f in names
+                           if f.startswith(("nc-create-", "nc-execute-")) and
+                           f.endswith("-ydk.xml"))
+        for fixture in files:
+            datastore.load_fixture(fixture)
+    return datastore
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-v", "--verbose", help="print debugging messages",
+                        action="store_true")
+    parser.add_argument("-a", "--address", default="127.0.0.1",
+                        help="address to listen on")
+    parser.add_argument("-p", "--port", type=int, default=8300,
+                        help="port to listen on")
+    parser.add_argument("-l", "--latency", type=float, default=0.0,
+                        help="reply latency in milliseconds")
+    parser.add_argument("-j", "--jitter", type=float, default=0.0,
+                        help="reply jitter in milliseconds")
+    parser.add_argument("-d", "--data",
+                        help="XML document whose top-level children are "
+                             "served as operational data by get")
+    parser.add_argument("-s", "--schemas",
+                        help="directory with YANG modules served by "
+                             "get-schema")
+    parser.add_argument("-k", "--host-key",
+                        help="SSH host key file (default: generated)")
+    parser.add_argument("--syslog", metavar="HOST:PORT",
+                        help="send logmsg RPC messages to this syslog "
+                             "receiver")
+    parser.add_argument("fixtures", nargs="*", default=[SAMPLES],
+                        help="app XML data files or directories to load "
+                             "(default: all nc-create and nc-execute apps "
+                             "in samples/basic)")
+    args = parser.parse_args()
+    enable_logging(args.verbose)
+
+    datastore = load_datastore(args.fixtures)
+    oper = None
+    if args.data:
+        oper = Datastore()
+        oper.edit(list(etree.parse(args.data).getroot()))
+    syslog = None
+    if args.syslog:
+        host, _, port = args.syslog.rpartition(":")
+        syslog = SyslogRelay(host or "127.0.0.1", int(port))
+    stub = StubDevice(datastore, latency=args.latency / 1000.0,
+                      jitter=args.jitter / 1000.0, oper=oper,
+                      schemas=args.schemas, host_key=args.host_key,
+                      syslog=syslog)
+    print("NETCONF stub with {models} models listening on "
+          "ssh://admin:admin@{address}:{port}".format(
+              models=len(datastore.modules), address=args.address,
+              port=args.port))
+    try:
+        stub.serve(args.address, args.port)
+    except KeyboardInterrupt:
+        pass
+    exit()
+# End of script
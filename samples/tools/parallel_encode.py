@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Encode the top-level models of a device build in parallel.
+
+A device build is a set of independent top-level objects (e.g. interface
+configuration, ISIS, BGP, RSVP, MPLS, telemetry and NTP), each created by
+the config_* function of an app.  Records use the format of
+batch_encode.py, one model per line:
+
+  {"device": "pe1", "app": "path/to/nc-create-xr-clns-isis-cfg-34-ydk.py",
+   "function": "config_isis", "params": {}}
+
+Only the record (app path, function name and parameters) is sent to a
+worker process, which builds and encodes the object and returns the
+payload text, so no object tree is pickled.  The payloads of each device
+are assembled in record order into one edit-config <config> element
+(with --rpc, a complete edit-config RPC for the candidate or running
+datastore) and written to OUTPUT/<device>.xml or stdout.
+
+usage: parallel_encode.py [-h] [-v] [-j JOBS] [-o OUTPUT] [-d CACHE]
+                          [--rpc {candidate,running}]
+                          [records]
+
+positional arguments:
+  records               JSON lines file with records (default: stdin)
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -v, --verbose         print debugging messages
+  -j JOBS, --jobs JOBS  worker processes (0 encodes in this process)
+  -o OUTPUT, --output OUTPUT
+                        output directory (default: stdout)
+  -d CACHE, --cache CACHE
+                        encode cache directory
+  --rpc {candidate,running}
+                        write edit-config RPCs for datastore
+"""
+
+from argparse import ArgumentParser
+from collections import OrderedDict
+from timeit import default_timer
+import logging
+import multiprocessing
+import os
+import re
+import sys
+
+from sample_app import enable_logging
+from batch_encode import (init_worker, encode_record, read_records,
+                          safe_name)
+
+NETCONF_NAMESPACE = "urn:ietf:params:xml:ns:netconf:base:1.0"
+
+XML_DECLARATION = re.compile(r"^\s*<\?xml[^>]*\?>\s*")
+
+logger = logging.getLogger("ydk.samples.parallel_encode")
+
+
+def encode_models(records, jobs=None, verbose=False, cache_directory=None):
+    """Encode records in worker processes; return results in record order.
+
+    Every record is a separate task, so the largest models of a build are
+    encoded at the same time.  With jobs=0 records are encoded in the
+    calling process.
+    """
+    records = list(records)
+    if jobs == 0:
+        init_worker(verbose, cache_directory)
+        return [encode_record(record) for record in records]
+    pool = multiprocessing.Pool(jobs, initializer=init_worker,
+                                initargs=(verbose, cache_directory))
+    try:
+        results = pool.map(encode_record, records, 1)
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+    return results
+
+
+def config_payload(payloads):
+    """Edit-config <config> element with the payloads of all models."""
+    parts = ['<config xmlns="%s">\n' % NETCONF_NAMESPACE]
+    for payload in payloads:
+        payload = XML_DECLARATION.sub("", payload).rstrip()
+        parts.append(payload + "\n")
+    parts.append("</config>\n")
+    return "".join(parts)
+
+
+def rpc_payload(config, target="candidate", message_id=1):
+    """Edit-config RPC for a <config> element."""
+    return ('<rpc xmlns="{namespace}" message-id="{message_id}">\n'
+            "<edit-config>\n"
+            "<target><{target}/></target>\n"
+            "{config}"
+            "</edit-config>\n"
+            "</rpc>\n").format(namespace=NETCONF_NAMESPACE,
+                               message_id=message_id, target=target,
+                               config=config)
+
+
+def assemble(results):
+    """Group results by device; return {device: (payloads, errors)}."""
+    devices = OrderedDict()
+    for result in results:
+        payloads, errors = devices.setdefault(result["device"], ([], []))
+        if "error" in result:
+            errors.append("{app}: {error}".format(**result))
+        else:
+            payloads.append(result["payload"])
+    return devices
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-v", "--verbose", help="print debugging messages",
+                        action="store_true")
+    parser.add_argument("-j", "--jobs", type=int,
+                        help="worker processes (0 encodes in this process)")
+    parser.add_argument("-o", "--output",
+                        help="output directory (default: stdout)")
+    parser.add_argument("-d", "--cache", help="encode cache directory")
+    parser.add_argument("--rpc", choices=("candidate", "running"),
+                        help="write edit-config RPCs for datastore")
+    parser.add_argument("records", nargs="?",
+                        help="JSON lines file with records (default: stdin)")
+    args = parser.parse_args()
+    enable_logging(args.verbose)
+
+    records = read_records(open(args.records) if args.records
+                           else sys.stdin)
+    start = default_timer()
+    results = encode_models(records, args.jobs, args.verbose, args.cache)
+    elapsed = default_timer() - start
+
+    if args.output and not os.path.isdir(args.output):
+        os.makedirs(args.output)
+    failed = 0
+    for message_id, (device, (payloads, errors)) in enumerate(
+            assemble(results).items(), 1):
+        if errors:
+            failed += 1
+            for error in errors:
+                sys.stderr.write("{device} {error}\n".format(device=device,
+                                                             error=error))
+            continue
+        payload = config_payload(payloads)
+        if args.rpc:
+            payload = rpc_payload(payload, args.rpc, message_id)
+        if args.output:
+            path = os.path.join(args.output, safe_name(device) + ".xml")
+            with open(path, "w") as output:
+                output.write(payload)
+        else:
+            sys.stdout.write(payload)
+
+    # sum of encode times is the time of encoding one model after another
+    encode_time = sum(result["time"] for result in results)
+    sys.stderr.write("{models} models in {time:.3f}s (encode time "
+                     "{encode:.3f}s, {speedup:.1f}x)\n".format(
+                         models=len(results), time=elapsed,
+                         encode=encode_time,
+                         speedup=encode_time / elapsed if elapsed else 0.0))
+    sys.exit(1 if failed else 0)
+# End of script
@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Render payloads of repetitive list entries from a compiled template.
+
+A template is compiled from a build function that creates the top-level
+object with one list entry per row (a dict of leaf values).  The payload
+of one and of two sample rows is encoded once with CodecService; the text
+added by the second entry is the entry block and the leafs given in the
+rows are its slots.  Rendering N rows then only formats leaf values into
+the block, without creating or encoding N entry objects, and produces the
+same bytes as CodecService (checked at compile time).
+
+Templates are provided for ARP entries (Cisco-IOS-XR-ipv4-arp-cfg, as in
+config_arpgmp of nc-create-xr-ipv4-arp-cfg-34-ydk.py) and segment routing
+mappings (Cisco-IOS-XR-segment-routing-ms-cfg, as in config_sr of
+nc-create-xr-segment-routing-ms-cfg-23-ydk.py).  The main program renders
+COUNT generated entries both ways, checks that the payloads are equal and
+reports the speedup.
+
+usage: payload_template.py [-h] [-v] [-n COUNT] [--no-codec] {arp,sr}
+
+positional arguments:
+  {arp,sr}              template to render
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -v, --verbose         print debugging messages
+  -n COUNT, --count COUNT
+                        number of entries
+  --no-codec            only render the template
+"""
+
+from argparse import ArgumentParser
+from timeit import default_timer
+import logging
+
+from sample_app import enable_logging
+from bulk_static_routes import generate_routes
+from json_codec import json_value
+
+try:
+    _STRING_TYPES = (str, unicode)
+except NameError:
+    _STRING_TYPES = (str,)
+
+logger = logging.getLogger("ydk.samples.payload_template")
+
+
+def xml_text(value):
+    """Leaf value as CodecService writes it in XML."""
+    if isinstance(value, _STRING_TYPES):
+        text = value
+    elif value is True or value is False:
+        return "true" if value else "false"
+    else:
+        text = json_value(value)
+        if not isinstance(text, _STRING_TYPES):
+            return str(text)
+    if "&" in text or "<" in text or ">" in text:
+        text = (text.replace("&", "&amp;").replace("<", "&lt;")
+                .replace(">", "&gt;"))
+    return text
+
+
+class TemplateError(Exception):
+    """Payload cannot be rendered from a template."""
+    pass
+
+
+def _inserted(shorter, longer):
+    """Start and end of the text inserted into shorter to get longer."""
+    start = 0
+    limit = len(shorter)
+    while start < limit and shorter[start] == longer[start]:
+        start += 1
+    end = 0
+    limit = len(shorter) - start
+    while end < limit and shorter[-1 - end] == longer[-1 - end]:
+        end += 1
+    return start, len(longer) - end
+
+
+def _yang_name(attribute):
+    return attribute.rstrip("_").replace("_", "-")
+
+
+class PayloadTemplate(object):
+    """Compiled payload with a repeated entry block."""
+
+    def __init__(self, build, slots, samples, encode):
+        """Compile template.
+
+        build(rows) returns the top-level object with one entry per row,
+        slots are the leaf attributes set from rows, samples are two rows
+        with distinct values for every slot and encode(obj) returns the
+        CodecService payload.
+        """
+        self.slots = tuple(slots)
+        if len(samples) != 2:
+            raise TemplateError("two sample rows are required")
+        one = encode(build(samples[:1]))
+        two = encode(build(samples))
+        start, end = _inserted(one, two)
+        block = two[start:end]
+
+        # split entry block into literal text and slot positions
+        positions = []
+        for slot in self.slots:
+            tag = _yang_name(slot)
+            leaf = "<%s>%s</%s>" % (tag, xml_text(samples[1][slot]), tag)
+            index = block.find(leaf)
+            if index < 0:
+                raise TemplateError("leaf %s not found in entry" % tag)
+            positions.append((index + len(tag) + 2,
+                              index + len(leaf) - len(tag) - 3, slot))
+        positions.sort()
+        fragments = []
+        previous = 0
+        for value_start, value_end, _ in positions:
+            fragments.append(block[previous:value_start]
+                             .replace("{", "{{").replace("}", "}}"))
+            previous = value_end
+        fragments.append(block[previous:].replace("{", "{{")
+                         .replace("}", "}}"))
+        self._order = [slot for _, _, slot in positions]
+        self._block = "".join(
+            fragment + ("{%d}" % index if index < len(positions) else "")
+            for index, fragment in enumerate(fragments)).format
+
+        first = self.render_entry(samples[0])
+        index = one.find(first)
+        if index < 0:
+            raise TemplateError("entry block not found in payload")
+        self.head = one[:index]
+        self.tail = one[index + len(first):]
+        if self.render(samples) != two:
+            raise TemplateError("rendered payload differs from codec output")
+
+    def render_entry(self, row):
+        """Text of one entry."""
+        return self._block(*[xml_text(row[slot]) for slot in self._order])
+
+    def render(self, rows):
+        """Payload with one entry per row."""
+        block = self._block
+        order = self._order
+        return "".join([self.head] +
+                       [block(*[xml_text(row[slot]) for slot in order])
+                        for row in rows] +
+                       [self.tail])
+
+
+def build_arpgmp(rows, vrf_name="RED"):
+    """ARP configuration with one static entry per row (config_arpgmp)."""
+    from ydk.models.cisco_ios_xr import Cisco_IOS_XR_ipv4_arp_cfg \
+        as xr_ipv4_arp_cfg
+
+    arpgmp = xr_ipv4_arp_cfg.Arpgmp()  # create object
+    vrf = arpgmp.Vrf()
+    vrf.vrf_name = vrf_name
+    for row in rows:
+        entry = vrf.entries.Entry()
+        entry.address = row["address"]
+        entry.mac_address = row["mac_address"]
+        entry.encapsulation = xr_ipv4_arp_cfg.ArpEncapEnum.arpa
+        entry.entry_type = xr_ipv4_arp_cfg.ArpEntryEnum.static
+        entry.interface = row["interface"]
+        vrf.entries.entry.append(entry)
+    arpgmp.vrf.append(vrf)
+    return arpgmp
+
+
+def arp_rows(count, start="172.16.0.1"):
+    """Yield count ARP entry rows."""
+    for index, (address, _, _, _) in enumerate(generate_routes(count, start,
+                                                               32, None)):
+        yield {"address": address,
+               "mac_address": "52:54:00:%02x:%02x:%02x" % (
+                   index >> 16 & 0xff, index >> 8 & 0xff, index & 0xff),
+               "interface": "GigabitEthernet0/0/0/%d" % (index % 8)}
+
+
+def build_sr(rows):
+    """Segment routing configuration with one mapping per row (config_sr)."""
+    from ydk.models.cisco_ios_xr import Cisco_IOS_XR_segment_routing_ms_cfg \
+        as xr_segment_routing_ms_cfg
+
+    sr = xr_segment_routing_ms_cfg.Sr()  # create object
+    for row in rows:
+        mapping = sr.mappings.Mapping()
+        mapping.af = "ipv6"
+        mapping.ip = row["ip"]
+        mapping.mask = 128
+        mapping.sid_start = row["sid_start"]
+        mapping.sid_range = row["sid_range"]
+        sr.mappings.mapping.append(mapping)
+    return sr
+
+
+def sr_rows(count, start="2001:db8::ff:1"):
+    """Yield count segment routing mapping rows."""
+    for index, (address, _, _, _) in enumerate(generate_routes(count, start,
+                                                               128, None)):
+        yield {"ip": address, "sid_start": 16000 + index,
+               "sid_range": 1 + index % 8}
+
+
+TEMPLATES = {"arp": (build_arpgmp, ("address", "mac_address", "interface"),
+                     arp_rows),
+             "sr": (build_sr, ("ip", "sid_start", "sid_range"), sr_rows)}
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-v", "--verbose", help="print debugging messages",
+                        action="store_true")
+    parser.add_argument("-n", "--count", type=int, default=100000,
+                        help="number of entries")
+    parser.add_argument("--no-codec", action="store_true",
+                        help="only render the template")
+    parser.add_argument("template", choices=sorted(TEMPLATES),
+                        help="template to render")
+    args = parser.parse_args()
+    enable_logging(args.verbose)
+
+    from ydk.services import CodecService
+    from ydk.providers import CodecServiceProvider
+
+    provider = CodecServiceProvider(type="xml")
+    codec = CodecService()
+    build, slots, generate = TEMPLATES[args.template]
+    rows = list(generate(args.count))
+
+    start = default_timer()
+    template = PayloadTemplate(build, slots, list(generate(2)),
+                               lambda obj: codec.encode(provider, obj))
+    compile_time = default_timer() - start
+    start = default_timer()
+    rendered = template.render(rows)
+    render_time = default_timer() - start
+    print("template: compile {compile:.3f}s, render {render:.3f}s, "
+          "{size} bytes".format(compile=compile_time, render=render_time,
+                                size=len(rendered)))
+
+    if not args.no_codec:
+        start = default_timer()
+        encoded = codec.encode(provider, build(rows))
+        codec_time = default_timer() - start
+        print("codec: build and encode {time:.3f}s, {size} bytes".format(
+            time=codec_time, size=len(encoded)))
+        print("payloads {equal}, speedup {speedup:.1f}x".format(
+            equal="equal" if encoded == rendered else "DIFFER",
+            speedup=codec_time / max(render_time, 1e-9)))
+
+    provider.close()
+    exit()
+# End of script
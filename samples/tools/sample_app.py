@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Load basic sample apps as reusable building blocks.
+
+The basic apps keep all model logic in a single config_*, process_* or
+prepare_*_rpc function and create their top-level object and service call
+in the main execution path.  This module imports an app without running its
+main path, creates the same top-level object, runs the app function on it and
+replays the app's service call against any provider.
+
+usage: sample_app.py [-h] [-v] path [path ...]
+
+positional arguments:
+  path           sample app file or directory to inspect
+
+optional arguments:
+  -h, --help     show this help message and exit
+  -v, --verbose  print debugging messages
+"""
+
+from argparse import ArgumentParser
+import ast
+import logging
+import os
+import re
+import sys
+
+try:
+    from imp import load_source
+except ImportError:
+    from importlib.machinery import SourceFileLoader
+
+    def load_source(name, path):
+        """Import module name from source file path."""
+        return SourceFileLoader(name, path).load_module()
+
+try:
+    import urlparse
+except ImportError:
+    # the basic apps import urlparse (Python 2); map it on Python 3
+    import urllib.parse as urlparse
+    sys.modules.setdefault("urlparse", urlparse)
+
+# default NETCONF port used when the device URL does not specify one
+NETCONF_PORT = 830
+
+# service objects and methods used by the basic apps in their main path
+SERVICE_CALLS = {"crud": ("create", "read", "update", "delete"),
+                 "executor": ("execute_rpc",),
+                 "codec": ("encode",)}
+
+_APP_NAME = re.compile(r"^(?P<prefix>cd-encode|nc-\w+)-(?P<model>.+)-"
+                       r"(?P<index>\d+)-ydk\.py$")
+_CREATE_OBJECT = re.compile(r"^\s*(?P<var>\w+) = (?P<module>\w+)\."
+                            r"(?P<cls>\w+)\(\)\s+# create object",
+                            re.MULTILINE)
+_FUNCTION = re.compile(r"^def (?P<name>(config|process|prepare)_\w+)\(",
+                       re.MULTILINE)
+
+logger = logging.getLogger("ydk.samples.sample_app")
+
+
+class SampleAppError(Exception):
+    """Sample app does not follow the basic app structure."""
+    pass
+
+
+class SampleApp(object):
+    """Basic sample app loaded as a module."""
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.name = os.path.basename(self.path)
+        match = _APP_NAME.match(self.name)
+        if not match:
+            raise SampleAppError("%s is not a basic sample app name" %
+                                 self.name)
+        self.prefix = match.group("prefix")
+        self.model = match.group("model")
+        self.index = int(match.group("index"))
+        with open(self.path) as app_file:
+            self.source = app_file.read()
+        match = _CREATE_OBJECT.search(self.source)
+        if not match:
+            raise SampleAppError("%s does not create a top-level object" %
+                                 self.name)
+        self.object_var = match.group("var")
+        self.object_module = match.group("module")
+        self.object_class = match.group("cls")
+        self.functions = [m.group("name")
+                          for m in _FUNCTION.finditer(self.source)]
+        self.service, self.operation, self._call_arg = self._service_call()
+        self._module = None
+
+    def __repr__(self):
+        return "SampleApp(%r)" % self.name
+
+    @property
+    def module(self):
+        """Imported app module (main execution path not executed)."""
+        if self._module is None:
+            module_name = "ydk_sample_" + re.sub(r"\W", "_", self.name[:-3])
+            logger.debug("Importing %s as %s", self.path, module_name)
+            self._module = load_source(module_name, self.path)
+        return self._module
+
+    @property
+    def builder(self):
+        """App function that populates the top-level object (or None)."""
+        for name in self.functions:
+            if not name.startswith("process_"):
+                return getattr(self.module, name)
+        return None
+
+    @property
+    def processor(self):
+        """App function that formats data read from a device (or None)."""
+        for name in self.functions:
+            if name.startswith("process_"):
+                return getattr(self.module, name)
+        return None
+
+    @property
+    def model_class(self):
+        """Class of the app's top-level object."""
+        return getattr(getattr(self.module, self.object_module),
+                       self.object_class)
+
+    def new_object(self):
+        """Create an empty top-level object."""
+        return self.model_class()
+
+    def build(self, obj=None):
+        """Create top-level object and populate it with the app function."""
+        if obj is None:
+            obj = self.new_object()
+        if self.builder is not None:
+            self.builder(obj)
+        return obj
+
+    def call_argument(self, obj):
+        """Evaluate the entity the app passes to its service call."""
+        if self._call_arg is None:
+            return obj
+        namespace = dict(vars(self.module))
+        namespace[self.object_var] = obj
+        return eval(self._call_arg, namespace)
+
+    def run(self, provider, obj=None):
+        """Replay the app's service call on provider and return result."""
+        from ydk.services import CRUDService, ExecutorService, CodecService
+
+        if obj is None:
+            obj = self.build()
+        if self.operation is None:
+            logger.debug("%s: service call disabled in app", self.name)
+            return None
+        entity = self.call_argument(obj)
+        if self.service == "crud":
+            result = getattr(CRUDService(), self.operation)(provider, entity)
+            if self.operation == "read" and self.processor is not None:
+                return self.processor(result)
+            return result
+        if self.service == "executor":
+            return ExecutorService().execute_rpc(provider, entity)
+        return CodecService().encode(provider, entity)
+
+    def fixture(self, extension):
+        """Path of the app data file with extension (or None)."""
+        path = self.path[:-3] + extension
+        return path if os.path.exists(path) else None
+
+    def _service_call(self):
+        """Find service, operation and argument of the app's main call."""
+        for node in ast.walk(ast.parse(self.source, self.path)):
+            if (isinstance(node, ast.Call) and
+                    isinstance(node.func, ast.Attribute) and
+                    isinstance(node.func.value, ast.Name) and
+                    node.func.attr in
+                    SERVICE_CALLS.get(node.func.value.id, ()) and
+                    len(node.args) == 2):
+                expression = ast.Expression(body=node.args[1])
+                return (node.func.value.id, node.func.attr,
+                        compile(expression, self.path, "eval"))
+        # boilerplate apps have their service call commented out
+        if self.prefix == "cd-encode":
+            return "codec", None, None
+        if self.prefix == "nc-execute":
+            return "executor", None, None
+        return "crud", None, None
+
+
+def find_apps(paths, prefix=None, model=None):
+    """Yield sample apps found in files or directory trees."""
+    for path in paths:
+        if os.path.isfile(path):
+            candidates = [path]
+        else:
+            candidates = []
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames.sort()
+                candidates.extend(os.path.join(dirpath, f)
+                                  for f in sorted(filenames))
+        for candidate in candidates:
+            match = _APP_NAME.match(os.path.basename(candidate))
+            if not match:
+                continue
+            if prefix and match.group("prefix") != prefix:
+                continue
+            if model and model not in match.group("model"):
+                continue
+            yield SampleApp(candidate)
+
+
+def parse_device(url):
+    """Parse device URL into NetconfServiceProvider keyword arguments."""
+    device = urlparse.urlparse(url)
+    return dict(address=device.hostname,
+                port=device.port or NETCONF_PORT,
+                username=device.username,
+                password=device.password,
+                protocol=device.scheme)
+
+
+def enable_logging(verbose):
+    """Log debug messages if verbose argument specified."""
+    if verbose:
+        logger = logging.getLogger("ydk")
+        logger.setLevel(logging.DEBUG)
+        handler = logging.StreamHandler()
+        formatter = logging.Formatter(("%(asctime)s - %(name)s - "
+                                      "%(levelname)s - %(message)s"))
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-v", "--verbose", help="print debugging messages",
+                        action="store_true")
+    parser.add_argument("path", nargs="+",
+                        help="sample app file or directory to inspect")
+    args = parser.parse_args()
+    enable_logging(args.verbose)
+
+    # print app structure without importing YDK
+    for app in find_apps(args.path):
+        print("{name:<52} {service}.{operation} {module}.{cls} "
+              "{functions}".format(name=app.name, service=app.service,
+                                   operation=app.operation,
+                                   module=app.object_module,
+                                   cls=app.object_class,
+                                   functions=",".join(app.functions)))
+
+    exit()
+# End of script
@@ -0,0 +1,325 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Synchronize the YANG schemas of devices into a local cache.
+
+For every device in the inventory, the schema list of
+ietf-netconf-monitoring (netconf-state/schemas) is read and only the YANG
+(identifier, version) pairs missing from the cache are downloaded with
+get-schema (GetSchemaRpc, as in nc-execute-ietf-netconf-monitoring-24).
+Downloads of a device are pipelined on its session (pipelined_executor.py)
+and devices are synchronized in parallel; a schema missing on several
+devices at once is downloaded only once.
+
+The cache directory is content-addressed and shared between devices and
+runs:
+
+  objects/ab/cdef...yang      schema text by SHA-256 digest
+  index/IDENTIFIER@VERSION    digest of a schema
+  devices/ADDRESS_PORT.json   schemas of a device (identifier@version to
+                              digest)
+
+so a new device running a known software release costs one schema list
+and no downloads.
+
+usage: schema_cache.py [-h] [-v] [-d DIRECTORY] [-w WORKERS] [-W WINDOW]
+                       inventory
+
+positional arguments:
+  inventory             file with one device URL per line ('-' for stdin)
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -v, --verbose         print debugging messages
+  -d DIRECTORY, --directory DIRECTORY
+                        schema cache directory
+  -w WORKERS, --workers WORKERS
+                        devices synchronized in parallel
+  -W WINDOW, --window WINDOW
+                        get-schema RPCs in flight per device
+"""
+
+from argparse import ArgumentParser
+import hashlib
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+try:
+    from xml.etree import cElementTree as ElementTree
+except ImportError:
+    from xml.etree import ElementTree
+
+from sample_app import parse_device, enable_logging
+from fleet_runner import read_inventory
+from netconf_stub import BASE_NS, MONITORING_NS
+from pipelined_executor import RpcError, connect
+
+LIST_SCHEMAS = ('<get xmlns="%s"><filter type="subtree">'
+                '<netconf-state xmlns="%s"><schemas/></netconf-state>'
+                "</filter></get>" % (BASE_NS, MONITORING_NS))
+
+logger = logging.getLogger("ydk.samples.schema_cache")
+
+
+def _tag(name):
+    return "{%s}%s" % (MONITORING_NS, name)
+
+
+def parse_schemas(data):
+    """Sorted (identifier, version) of YANG schemas in get reply data."""
+    schemas = set()
+    for schema in ElementTree.fromstring(data).iter(_tag("schema")):
+        schema_format = (schema.findtext(_tag("format")) or "yang").strip()
+        if schema_format.rsplit(":", 1)[-1] != "yang":
+            continue
+        schemas.add((schema.findtext(_tag("identifier")).strip(),
+                     (schema.findtext(_tag("version")) or "").strip()))
+    return sorted(schemas)
+
+
+def get_schema_rpc(identifier, version):
+    """GetSchemaRpc for a YANG schema (see prepare_get_schema_rpc)."""
+    from ydk.models.ietf import ietf_netconf_monitoring
+
+    get_schema_rpc = ietf_netconf_monitoring.GetSchemaRpc()
+    get_schema_rpc.input.identifier = identifier
+    if version:
+        get_schema_rpc.input.version = version
+    get_schema_rpc.input.format = ietf_netconf_monitoring.YangIdentity()
+    return get_schema_rpc
+
+
+def schema_text(data):
+    """Schema text of get-schema reply data."""
+    return ElementTree.fromstring(data).text or ""
+
+
+class SchemaCache(object):
+    """Content-addressed YANG schema store shared by threads and runs."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.stats = dict(hits=0, downloads=0, shared=0)
+        self._pending = {}    # (identifier, version) -> threading.Event
+        self._lock = threading.Lock()
+
+    def lookup(self, identifier, version):
+        """Digest of a cached schema (or None)."""
+        try:
+            with open(self._index_path(identifier, version)) as index:
+                return index.read().strip()
+        except IOError:
+            return None
+
+    def read(self, identifier, version):
+        """Text of a cached schema (or None)."""
+        digest = self.lookup(identifier, version)
+        if digest is None:
+            return None
+        with io.open(self._object_path(digest), encoding="utf-8") as schema:
+            return schema.read()
+
+    def store(self, identifier, version, text):
+        """Store schema text; return its digest."""
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            _write(path, data)
+        _write(self._index_path(identifier, version), digest.encode("ascii"))
+        return digest
+
+    def claim(self, schemas):
+        """Split missing schemas into those to download and those pending.
+
+        Schemas returned for download must be released with release();
+        pending schemas are being downloaded by another thread.
+        """
+        download, pending = [], []
+        with self._lock:
+            for key in schemas:
+                if self.lookup(*key) is not None:
+                    self.stats["hits"] += 1
+                elif key in self._pending:
+                    self.stats["shared"] += 1
+                    pending.append((key, self._pending[key]))
+                else:
+                    self._pending[key] = threading.Event()
+                    download.append(key)
+        return download, pending
+
+    def release(self, key, downloaded=True):
+        with self._lock:
+            self._pending.pop(key).set()
+            if downloaded:
+                self.stats["downloads"] += 1
+
+    def _object_path(self, digest):
+        return os.path.join(self.directory, "objects", digest[:2],
+                            digest[2:] + ".yang")
+
+    def _index_path(self, identifier, version):
+        return os.path.join(self.directory, "index",
+                            "%s@%s" % (identifier, version))
+
+
+def _write(path, data):
+    """Write file atomically (write and rename)."""
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory)
+    except OSError:
+        if not os.path.isdir(directory):
+            raise
+    handle, temp = tempfile.mkstemp(dir=directory)
+    with os.fdopen(handle, "wb") as output:
+        output.write(data)
+    os.rename(temp, path)
+
+
+def sync_device(url, cache, window=16, factory=connect):
+    """Download missing schemas of one device; return result dict."""
+    device = parse_device(url)
+    name = "%s:%s" % (device["address"], device["port"])
+    result = dict(device=name, status="ok", schemas=0, downloads=0,
+                  errors=0)
+    start = time.time()
+    session = None
+    unfinished = set()
+    try:
+        session = factory(url, window)
+        schemas = parse_schemas(session.execute_rpc(LIST_SCHEMAS))
+        result["schemas"] = len(schemas)
+        download, pending = cache.claim(schemas)
+        unfinished.update(download)
+        rpcs = [get_schema_rpc(*key) for key in download]
+        for index, reply in session.iter_rpcs(rpcs):
+            key = download[index]
+            if isinstance(reply, RpcError):
+                logger.debug("get-schema %s@%s failed: %s", key[0], key[1],
+                             reply)
+                result["errors"] += 1
+                cache.release(key, downloaded=False)
+            else:
+                cache.store(key[0], key[1], schema_text(reply))
+                result["downloads"] += 1
+                cache.release(key)
+            unfinished.discard(key)
+        for _, event in pending:
+            event.wait()
+        manifest = {}
+        for identifier, version in schemas:
+            digest = cache.lookup(identifier, version)
+            if digest is None:
+                result["errors"] += 1
+            else:
+                manifest["%s@%s" % (identifier, version)] = digest
+        _write(os.path.join(cache.directory, "devices",
+                            name.replace(":", "_") + ".json"),
+               json.dumps(manifest, indent=2, sort_keys=True)
+               .encode("utf-8"))
+        if result["errors"]:
+            result["status"] = "error"
+    except Exception as error:
+        result["status"] = "error"
+        result["error"] = "%s: %s" % (type(error).__name__, error)
+    finally:
+        # let threads waiting for unfinished downloads go on
+        for key in unfinished:
+            cache.release(key, downloaded=False)
+        if session is not None:
+            session.close()
+    result["time"] = round(time.time() - start, 6)
+    return result
+
+
+def sync_fleet(urls, cache, workers=8, window=16, factory=connect):
+    """Synchronize devices in worker threads; yield results."""
+    devices = queue.Queue()
+    for url in urls:
+        devices.put(url)
+    results = queue.Queue()
+
+    def work():
+        while True:
+            try:
+                url = devices.get_nowait()
+            except queue.Empty:
+                results.put(None)
+                return
+            results.put(sync_device(url, cache, window, factory))
+
+    threads = [threading.Thread(target=work)
+               for _ in range(max(1, min(workers, devices.qsize())))]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    running = len(threads)
+    while running:
+        result = results.get()
+        if result is None:
+            running -= 1
+        else:
+            yield result
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-v", "--verbose", help="print debugging messages",
+                        action="store_true")
+    parser.add_argument("-d", "--directory", default="schemas",
+                        help="schema cache directory")
+    parser.add_argument("-w", "--workers", type=int, default=8,
+                        help="devices synchronized in parallel")
+    parser.add_argument("-W", "--window", type=int, default=16,
+                        help="get-schema RPCs in flight per device")
+    parser.add_argument("inventory",
+                        help="file with one device URL per line "
+                             "('-' for stdin)")
+    args = parser.parse_args()
+    enable_logging(args.verbose)
+
+    inventory = sys.stdin if args.inventory == "-" else open(args.inventory)
+    cache = SchemaCache(args.directory)
+    start = time.time()
+    devices = failed = 0
+    for result in sync_fleet(read_inventory(inventory), cache,
+                             args.workers, args.window):
+        devices += 1
+        failed += result["status"] != "ok"
+        print("{device}: {schemas} schemas, {downloads} downloaded, "
+              "{errors} errors, {time:.3f}s{error}".format(
+                  error=" (%s)" % result["error"] if "error" in result
+                  else "", **result))
+    print("{devices} devices in {time:.3f}s: {downloads} schemas "
+          "downloaded, {hits} cache hits, {shared} shared downloads".format(
+              devices=devices, time=time.time() - start, **cache.stats))
+    sys.exit(1 if failed else 0)
+# End of script
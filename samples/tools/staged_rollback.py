@@ -0,0 +1,331 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Roll back configuration on a fleet of devices in stages.
+
+The rollback RPC (Cisco-IOS-XR-cfgmgr-rollback-act) is prepared by the
+prepare_roll_back_configuration*_rpc function of an nc-execute app, e.g.
+roll back the last COUNT commits, to a commit id or to a label, and input
+leafs can be overridden with -s LEAF=VALUE.  Devices of the inventory are
+rolled back in stages: a canary stage, waves and a full stage, given as
+cumulative device counts or fleet percentages (--stages 1,5%,25%,100%).
+Each stage runs with its own number of parallel sessions (--parallel
+1,8,32,128).  A stage halts, and no further stage is started, as soon as
+its errors exceed --max-error-rate percent of its devices (any error in
+the canary stage); devices already in progress are completed.  With
+--pause, the next stage starts after a bake time.
+
+Progress is streamed: one JSON line per device is written to the result
+log as soon as it completes and a status line (stage, devices done,
+errors, rate) is updated on stderr.
+
+usage: staged_rollback.py [-h] [-v] [--stages STAGES] [--parallel PARALLEL]
+                          [--max-error-rate MAX_ERROR_RATE]
+                          [--pause PAUSE] [-s LEAF=VALUE] [-t TIMEOUT]
+                          [-o OUTPUT] [-n]
+                          inventory app
+
+positional arguments:
+  inventory             file with one device URL per line ('-' for stdin)
+  app                   cfgmgr-rollback-act app with prepare function
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -v, --verbose         print debugging messages
+  --stages STAGES       cumulative devices or percentages per stage
+  --parallel PARALLEL   parallel sessions per stage
+  --max-error-rate MAX_ERROR_RATE
+                        halt a stage above this error rate (percent)
+  --pause PAUSE         seconds between stages
+  -s LEAF=VALUE, --set LEAF=VALUE
+                        set RPC input leaf (e.g. label=PRB-005)
+  -t TIMEOUT, --timeout TIMEOUT
+                        NETCONF operation timeout in seconds
+  -o OUTPUT, --output OUTPUT
+                        result log file (JSON lines, default stdout)
+  -n, --dry-run         print stage plan without contacting devices
+"""
+
+from argparse import ArgumentParser
+import json
+import logging
+import sys
+import threading
+import time
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from sample_app import SampleApp, parse_device, enable_logging
+from session_pool import create_provider
+from fleet_runner import read_inventory, is_timeout
+from stream_decode import leaf_value
+
+logger = logging.getLogger("ydk.samples.staged_rollback")
+
+# marker that tells a worker to exit
+_DONE = None
+
+
+def stage_plan(count, stages, parallel):
+    """Split count devices into (name, start, end, parallel) stages.
+
+    stages are cumulative device counts or percentages ("5%"); the last
+    stage always ends with the last device.
+    """
+    ends = []
+    for stage in stages:
+        if stage.endswith("%"):
+            end = int(-(-count * float(stage[:-1]) // 100))
+        else:
+            end = int(stage)
+        end = min(max(end, 1), count)
+        if not ends or end > ends[-1]:
+            ends.append(end)
+    if not ends or ends[-1] < count:
+        ends.append(count)
+    plan = []
+    start = 0
+    for index, end in enumerate(ends):
+        if index == 0 and len(ends) > 1:
+            name = "canary"
+        elif index == len(ends) - 1:
+            name = "full"
+        else:
+            name = "wave %d" % index
+        workers = parallel[min(index, len(parallel) - 1)]
+        plan.append((name, start, end, workers))
+        start = end
+    return plan
+
+
+def set_input(rpc, assignments):
+    """Set RPC input leafs from LEAF=VALUE strings."""
+    try:
+        members = dict((member.presentation_name, member) for member in
+                       rpc.input._meta_info().meta_info_class_members)
+    except (AttributeError, TypeError):
+        members = {}
+    for assignment in assignments:
+        name, _, text = assignment.partition("=")
+        name = name.strip().replace("-", "_")
+        if not hasattr(rpc.input, name):
+            raise ValueError("%s has no input leaf %s" %
+                             (type(rpc).__name__, name))
+        setattr(rpc.input, name, leaf_value(text, members.get(name)))
+
+
+def rollback_device(url, rpc, timeout=None, factory=create_provider):
+    """Execute rollback RPC on one device and return result.
+
+    timeout is passed to the session (see create_provider): the RPC call
+    itself fails and the session is closed before the result is reported,
+    so no helper thread or session outlives a device.
+    """
+    from ydk.services import ExecutorService
+
+    device = parse_device(url)
+    result = dict(device="%s:%s" % (device["address"], device["port"]),
+                  status="ok")
+    start = time.time()
+    provider = None
+    try:
+        provider = factory(url, timeout)
+        ExecutorService().execute_rpc(provider, rpc)
+    except Exception as error:
+        result["status"] = "timeout" if timeout and is_timeout(error) \
+            else "error"
+        result["error"] = "%s: %s" % (type(error).__name__, error)
+    finally:
+        if provider is not None:
+            try:
+                provider.close()
+            except Exception as error:
+                logger.debug("Error closing session: %s", error)
+    result["time"] = round(time.time() - start, 6)
+    return result
+
+
+def run_stage(urls, rpc, workers, max_errors, timeout=None,
+              factory=create_provider):
+    """Roll back urls with workers threads; yield results as they complete.
+
+    Dispatching stops when more than max_errors devices fail; the
+    generator then finishes with the devices in progress.
+    """
+    devices = queue.Queue()
+    for url in urls:
+        devices.put(url)
+    results = queue.Queue()
+    halted = threading.Event()
+    errors = []
+    lock = threading.Lock()
+
+    def work():
+        while not halted.is_set():
+            try:
+                url = devices.get_nowait()
+            except queue.Empty:
+                break
+            result = rollback_device(url, rpc, timeout, factory)
+            if result["status"] != "ok":
+                # checked before any worker takes its next device
+                with lock:
+                    errors.append(result)
+                    if len(errors) > max_errors:
+                        halted.set()
+            results.put(result)
+        results.put(_DONE)
+
+    threads = [threading.Thread(target=work)
+               for _ in range(min(workers, len(urls)))]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    running = len(threads)
+    while running:
+        result = results.get()
+        if result is _DONE:
+            running -= 1
+            continue
+        yield result
+
+
+class Progress(object):
+    """Status line on stderr, rewritten in place on a terminal."""
+
+    def __init__(self, total, stream=sys.stderr):
+        self.total = total
+        self.stream = stream
+        self.done = 0
+        self.errors = 0
+        self.start = time.time()
+        self._tty = getattr(stream, "isatty", lambda: False)()
+        self._last = 0.0
+
+    def update(self, stage, result=None, force=False):
+        if result is not None:
+            self.done += 1
+            self.errors += result["status"] != "ok"
+        now = time.time()
+        if not force and not self._tty and now - self._last < 5.0:
+            return
+        self._last = now
+        elapsed = now - self.start
+        rate = self.done / elapsed if elapsed else 0.0
+        line = ("{stage}: {done}/{total} devices, {errors} errors, "
+                "{rate:.1f}/s, {elapsed:.0f}s".format(
+                    stage=stage, done=self.done, total=self.total,
+                    errors=self.errors, rate=rate, elapsed=elapsed))
+        if self._tty:
+            self.stream.write("\r" + line.ljust(72))
+        else:
+            self.stream.write(line + "\n")
+        self.stream.flush()
+
+    def finish(self, message):
+        self.stream.write(("\n" if self._tty else "") + message + "\n")
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-v", "--verbose", help="print debugging messages",
+                        action="store_true")
+    parser.add_argument("--stages", default="1,5%,25%,100%",
+                        help="cumulative devices or percentages per stage")
+    parser.add_argument("--parallel", default="1,8,32,128",
+                        help="parallel sessions per stage")
+    parser.add_argument("--max-error-rate", type=float, default=5.0,
+                        help="halt a stage above this error rate (percent)")
+    parser.add_argument("--pause", type=float, default=0.0,
+                        help="seconds between stages")
+    parser.add_argument("-s", "--set", action="append", default=[],
+                        metavar="LEAF=VALUE",
+                        help="set RPC input leaf (e.g. label=PRB-005)")
+    parser.add_argument("-t", "--timeout", type=float,
+                        help="NETCONF operation timeout in seconds")
+    parser.add_argument("-o", "--output",
+                        help="result log file (JSON lines, default stdout)")
+    parser.add_argument("-n", "--dry-run", action="store_true",
+                        help="print stage plan without contacting devices")
+    parser.add_argument("inventory",
+                        help="file with one device URL per line "
+                             "('-' for stdin)")
+    parser.add_argument("app",
+                        help="cfgmgr-rollback-act app with prepare function")
+    args = parser.parse_args()
+    enable_logging(args.verbose)
+
+    app = SampleApp(args.app)
+    if "rollback-act" not in app.model:
+        parser.error("%s is not a cfgmgr-rollback-act app" % app.name)
+    inventory = sys.stdin if args.inventory == "-" else open(args.inventory)
+    urls = list(read_inventory(inventory))
+    parallel = [int(value) for value in args.parallel.split(",")]
+    plan = stage_plan(len(urls), args.stages.split(","), parallel)
+
+    if args.dry_run:
+        for name, start, end, workers in plan:
+            print("{name}: {count} devices ({first} to {last}), {workers} "
+                  "parallel".format(name=name, count=end - start,
+                                    first=start + 1, last=end,
+                                    workers=workers))
+        exit()
+
+    rpc = app.build()
+    set_input(rpc, args.set)
+    output = open(args.output, "w") if args.output else sys.stdout
+    progress = Progress(len(urls))
+    halted = None
+    for index, (name, start, end, workers) in enumerate(plan):
+        if index and args.pause:
+            progress.update("bake before %s" % name, force=True)
+            time.sleep(args.pause)
+        # any error in the canary stage halts the rollout
+        max_errors = 0 if name == "canary" else \
+            int(args.max_error_rate * (end - start) // 100)
+        errors = 0
+        for result in run_stage(urls[start:end], rpc, workers, max_errors,
+                                args.timeout):
+            result["stage"] = name
+            errors += result["status"] != "ok"
+            output.write(json.dumps(result, sort_keys=True) + "\n")
+            output.flush()
+            progress.update(name, result)
+        if errors > max_errors:
+            halted = name
+            break
+
+    elapsed = time.time() - progress.start
+    if halted:
+        progress.finish("halted in {stage}: {done}/{total} devices, "
+                        "{errors} errors in {time:.1f}s".format(
+                            stage=halted, done=progress.done,
+                            total=len(urls), errors=progress.errors,
+                            time=elapsed))
+        exit(2)
+    progress.finish("{done}/{total} devices, {errors} errors in "
+                    "{time:.1f}s".format(done=progress.done,
+                                         total=len(urls),
+                                         errors=progress.errors,
+                                         time=elapsed))
+    exit(1 if progress.errors else 0)
+# End of script
@@ -0,0 +1,380 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Decode XML payloads into model objects incrementally.
+
+The payload (an app fixture, a CodecService payload or a NETCONF reply) is
+parsed with iterparse.  Entries of the list given by a path of YANG names
+from the top-level container, e.g.
+
+  interface-configurations/interface-configuration
+  bgp/instance/instance-as/four-byte-as/default-vrf/bgp-entity/neighbors/
+  neighbor
+
+are decoded one at a time into new list entry objects and their parsed
+elements are freed, so memory stays proportional to one entry.  Ancestor
+containers and list entries on the path are decoded once and set as parent
+of every entry (entries are not appended to the ancestor list).  Leaf values
+are converted with the leaf types of the model meta information.  Without a
+list path, the whole payload is decoded into one top-level object.
+
+usage: stream_decode.py [-h] [-v] [-l LIST] [-q] app [payload]
+
+positional arguments:
+  app                   app whose top-level object is decoded
+  payload               XML payload (default: fixture of app)
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -v, --verbose         print debugging messages
+  -l LIST, --list LIST  YANG path of the list whose entries are streamed
+  -q, --quiet           do not print entry keys
+"""
+
+from argparse import ArgumentParser
+from timeit import default_timer
+from functools import reduce
+import importlib
+import logging
+import re
+
+try:
+    from xml.etree import cElementTree as ElementTree
+except ImportError:
+    from xml.etree import ElementTree
+
+from sample_app import SampleApp, enable_logging
+from entity_tree import is_entity, entry_key, meta_kind, CONTAINER, LIST, \
+    LEAF_LIST, LEAF
+from filtered_read import class_name
+from benchmark import peak_rss
+
+logger = logging.getLogger("ydk.samples.stream_decode")
+
+
+def local_name(tag):
+    """Tag without namespace ({ns}name -> name)."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def yang_name(entity):
+    """YANG name of a model class or object."""
+    try:
+        return entity._meta_info().yang_name
+    except (AttributeError, TypeError):
+        cls = entity if isinstance(entity, type) else type(entity)
+        return re.sub(r"(?<!^)([A-Z])", r"-\1", cls.__name__).lower()
+
+
+def _members(entity):
+    """Member meta information of entity by YANG name."""
+    try:
+        return dict((member.name, member)
+                    for member in entity._meta_info().meta_info_class_members)
+    except (AttributeError, TypeError):
+        return {}
+
+
+def _attribute(entity, member, name):
+    """Python attribute name of a member."""
+    if member is not None:
+        return member.presentation_name
+    attribute = name.replace("-", "_")
+    return attribute if hasattr(entity, attribute) else attribute + "_"
+
+
+def _model_class(member):
+    """Class referenced by a member (or None)."""
+    try:
+        module = importlib.import_module(member.pmodule_name)
+        return reduce(getattr, member.clazz_name.split("."), module)
+    except (AttributeError, ImportError, TypeError):
+        return None
+
+
+def _enum_value(text, member):
+    """Enum literal of member for text (or None)."""
+    enum = _model_class(member)
+    try:
+        literals = enum._meta_info().literal_map
+    except (AttributeError, TypeError):
+        return None
+    for name in (text, text.upper(), text.lower()):
+        if name in literals:
+            return getattr(enum, literals[name])
+    return None
+
+
+_IDENTITIES = None
+
+
+def _identity_value(text, member):
+    """Identity object for text, e.g. oc-types:IPV4_UNICAST (or None)."""
+    global _IDENTITIES
+    if _IDENTITIES is None:
+        from ydk.providers._importer import _yang_ns
+
+        # identity name -> [(Python module, class name)]
+        _IDENTITIES = {}
+        for (_, name), target in sorted(_yang_ns._identity_map.items()):
+            _IDENTITIES.setdefault(name, []).append(target)
+    # the prefix is not resolved, so a name defined in several modules
+    # prefers the module of the member's base identity
+    candidates = _IDENTITIES.get(text.rsplit(":", 1)[-1], [])
+    for module_name, class_name in candidates:
+        if module_name == member.pmodule_name or len(candidates) == 1:
+            module = importlib.import_module(module_name)
+            return getattr(module, class_name)()
+    return None
+
+
+def _typed_value(text, member):
+    """Convert text with the type of a non-union member (None if invalid)."""
+    from ydk._core._dm_meta_info import REFERENCE_ENUM_CLASS, \
+        REFERENCE_IDENTITY_CLASS
+    from ydk.types import Empty, Decimal64
+
+    ptype = member.ptype or ""
+    if member.mtype == REFERENCE_ENUM_CLASS or ptype.endswith("Enum"):
+        return _enum_value(text, member)
+    if member.mtype == REFERENCE_IDENTITY_CLASS or \
+            ptype.endswith("Identity"):
+        return _identity_value(text, member)
+    if ptype == "Empty":
+        return None if text else Empty()
+    if ptype == "bool":
+        return {"true": True, "false": False}.get(text)
+    try:
+        if ptype in ("int", "long"):
+            return int(text)
+        if ptype == "Decimal64":
+            float(text)
+            return Decimal64(text)
+    except ValueError:
+        return None
+    if ptype == "str":
+        return text
+    return None
+
+
+def _union_value(text, member):
+    """Convert text with the first matching non-string type of a union.
+
+    A string matches anything, so None is returned if only a string
+    member matches.
+    """
+    from ydk._core._dm_meta_info import REFERENCE_UNION
+
+    for contained in member.members:
+        if contained.mtype == REFERENCE_UNION:
+            value = _union_value(text, contained)
+        elif contained.ptype != "str":
+            value = _typed_value(text, contained)
+        else:
+            continue
+        if value is not None:
+            return value
+    return None
+
+
+def leaf_value(text, member):
+    """Convert leaf text to the Python type of member."""
+    from ydk._core._dm_meta_info import REFERENCE_UNION
+
+    text = (text or "").strip()
+    if member is None:
+        return text
+    if member.mtype == REFERENCE_UNION:
+        value = _union_value(text, member)
+    else:
+        value = _typed_value(text, member)
+    return text if value is None else value
+
+
+def child_class(entity, member, attribute):
+    """Class of the entries (or container) of an attribute of entity."""
+    cls = _model_class(member) if member is not None else None
+    return cls or getattr(type(entity), class_name(attribute))
+
+
+def _is_bits(value):
+    from ydk.types import FixedBitsDict
+
+    return isinstance(value, FixedBitsDict)
+
+
+def decode_child(entity, element):
+    """Decode child element into the matching attribute of entity."""
+    name = local_name(element.tag)
+    member = _members(entity).get(name)
+    attribute = _attribute(entity, member, name)
+    value = getattr(entity, attribute, None)
+    kind = meta_kind(member)
+    if member is None:
+        # no meta information: guess from the value and the element
+        if is_entity(value) or (value is None and len(element)):
+            kind = CONTAINER
+        elif isinstance(value, list):
+            kind = LIST if len(element) else LEAF_LIST
+    elif kind is None:
+        # unions
+        kind = LEAF_LIST if isinstance(value, list) else LEAF
+    if kind == CONTAINER:
+        if value is None:
+            # presence containers are None until set
+            value = child_class(entity, member, attribute)()
+            value.parent = entity
+            setattr(entity, attribute, value)
+        decode_element(value, element)
+    elif kind == LIST:
+        entry = child_class(entity, member, attribute)()
+        decode_element(entry, element)
+        value.append(entry)
+    elif kind == LEAF_LIST:
+        value.append(leaf_value(element.text, member))
+    elif _is_bits(value):
+        for bit in (element.text or "").split():
+            value[bit] = True
+    else:
+        setattr(entity, attribute, leaf_value(element.text, member))
+
+
+def decode_element(entity, element):
+    """Decode all children of element into entity."""
+    for child in element:
+        decode_child(entity, child)
+    return entity
+
+
+def decode(source, model_class):
+    """Decode a whole payload into a new top-level object.
+
+    For an RPC with input, the payload holds the input leafs (as the data
+    files of the nc-execute apps do).
+    """
+    name = yang_name(model_class)
+    for _, element in ElementTree.iterparse(source):
+        if local_name(element.tag) == name:
+            obj = model_class()
+            if getattr(obj, "input", None) is not None:
+                decode_element(obj.input, element)
+                return obj
+            return decode_element(obj, element)
+    raise ValueError("no %s element in payload" % name)
+
+
+def iter_entries(source, model_class, path):
+    """Yield list entries at path (YANG names from the top-level) one by one.
+
+    Memory use is bounded by the largest entry plus the ancestors on path.
+    """
+    path = [name for name in path.strip("/").split("/") if name]
+    if path[0] != yang_name(model_class):
+        path.insert(0, yang_name(model_class))
+    last = len(path) - 1
+    # open elements: (element, ancestor entity, position on path or None)
+    stack = []
+    on_path = 0
+    for event, element in ElementTree.iterparse(source, ("start", "end")):
+        name = local_name(element.tag)
+        if event == "start":
+            entity, position = None, None
+            parent_position = stack[-1][2] if stack else None
+            if not on_path and name == path[0]:
+                entity, position = model_class(), 0
+            elif (parent_position is not None and parent_position < last and
+                  name == path[parent_position + 1]):
+                position = parent_position + 1
+                if position < last:
+                    entity = _ancestor(stack[-1][1], name)
+            if position is not None:
+                on_path += 1
+            stack.append((element, entity, position))
+            continue
+        element, entity, position = stack.pop()
+        ancestor = stack[-1][1] if stack else None
+        if position is not None:
+            on_path -= 1
+        if position == last:
+            member = _members(ancestor).get(name)
+            attribute = _attribute(ancestor, member, name)
+            entry = child_class(ancestor, member, attribute)()
+            decode_element(entry, element)
+            entry.parent = ancestor
+            yield entry
+        elif position is None and ancestor is not None:
+            # leafs and other children of ancestors are decoded in place
+            decode_child(ancestor, element)
+        elif position is None:
+            # inside an entry (decoded with the entry) or outside the model
+            continue
+        if stack:
+            stack[-1][0].remove(element)
+
+
+def _ancestor(entity, name):
+    """Container or new list entry for child name of entity on path."""
+    member = _members(entity).get(name)
+    attribute = _attribute(entity, member, name)
+    value = getattr(entity, attribute)
+    if isinstance(value, list):
+        entry = child_class(entity, member, attribute)()
+        value.append(entry)
+        return entry
+    if value is None:
+        value = child_class(entity, member, attribute)()
+        value.parent = entity
+        setattr(entity, attribute, value)
+    return value
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-v", "--verbose", help="print debugging messages",
+                        action="store_true")
+    parser.add_argument("-l", "--list",
+                        help="YANG path of the list whose entries are "
+                             "streamed")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="do not print entry keys")
+    parser.add_argument("app", help="app whose top-level object is decoded")
+    parser.add_argument("payload", nargs="?",
+                        help="XML payload (default: fixture of app)")
+    args = parser.parse_args()
+    enable_logging(args.verbose)
+
+    app = SampleApp(args.app)
+    payload = args.payload or app.fixture(".xml")
+    if payload is None:
+        parser.error("%s has no XML fixture" % app.name)
+
+    start = default_timer()
+    if args.list:
+        count = 0
+        for entry in iter_entries(payload, app.model_class, args.list):
+            count += 1
+            if not args.quiet:
+                print(" ".join(str(key) for key in entry_key(entry)))
+    else:
+        decode(payload, app.model_class)
+        count = 1
+    print("{count} objects in {time:.3f}s, peak RSS {rss} KB".format(
+        count=count, time=default_timer() - start, rss=peak_rss()))
+    exit()
+# End of script
@@ -0,0 +1,387 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Measure end-to-end syslog throughput with Cisco-IOS-XR-syslog-act.
+
+Every device in the inventory logs messages with the LogmsgRpc prepared by
+a nc-execute-xr-syslog-act app (prepare_logmsg_rpc); the message and
+severity of each RPC are replaced by a sequence-numbered message
+
+  ydk-syslog-load RUN SEQUENCE
+
+and a severity picked at random from the severity mix (SEVERITY[:WEIGHT]
+list, e.g. info:8,warning:1,error:1).  Each device gets SESSIONS NETCONF
+sessions paced by a token bucket per device that releases RATE messages
+per second.  A syslog listener on LISTEN (UDP) receives the messages the
+devices send to their syslog host, which must be configured to be this
+host, and matches their sequence numbers with the messages sent.  After
+the run and a drain time, loss, duplicates and the latency from sending
+the RPC to receiving the message (percentiles) are printed in total and
+per severity.  Messages of other runs are ignored.
+
+usage: syslog_load.py [-h] [-v] [-l LISTEN] [-s SESSIONS] [-r RATE]
+                      [-d DURATION] [-b BURST] [--severity SEVERITY]
+                      [--drain DRAIN] [--max-loss MAX_LOSS] [--seed SEED]
+                      inventory [app]
+
+positional arguments:
+  inventory             file with one device URL per line ('-' for stdin)
+  app                   syslog-act app with prepare_logmsg_rpc function
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -v, --verbose         print debugging messages
+  -l LISTEN, --listen LISTEN
+                        [ADDRESS:]PORT of the syslog listener
+  -s SESSIONS, --sessions SESSIONS
+                        sessions per device
+  -r RATE, --rate RATE  messages per second per device
+  -d DURATION, --duration DURATION
+                        seconds to send messages
+  -b BURST, --burst BURST
+                        token bucket size
+  --severity SEVERITY   severity mix (SEVERITY[:WEIGHT],...)
+  --drain DRAIN         seconds to wait for messages after sending
+  --max-loss MAX_LOSS   loss in percent above which the exit status is 1
+  --seed SEED           random seed of the severity mix
+"""
+
+from argparse import ArgumentParser
+from bisect import bisect_right
+from timeit import default_timer
+import itertools
+import logging
+import os
+import random
+import re
+import socket
+import sys
+import threading
+import time
+import uuid
+
+from sample_app import SampleApp, parse_device, enable_logging
+from session_pool import create_provider
+from fleet_runner import read_inventory
+from benchmark import percentile
+from trap_load import TokenBucket
+from netconf_stub import SEVERITIES
+
+LOGMSG_APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..",
+                          "basic", "executor", "models", "cisco-ios-xr",
+                          "Cisco-IOS-XR-syslog-act",
+                          "nc-execute-xr-syslog-act-20-ydk.py")
+
+MARKER = "ydk-syslog-load"
+
+# optional PRI of a BSD or RFC 5424 message and the marker in its text
+DATAGRAM = re.compile(r"^(?:<(?P<pri>\d{1,3})>)?.*?%s (?P<run>\w+) "
+                      r"(?P<sequence>\d+)" % MARKER, re.DOTALL)
+
+logger = logging.getLogger("ydk.samples.syslog_load")
+
+
+def parse_severities(spec):
+    """List of (severity, weight) of SEVERITY[:WEIGHT],... specification."""
+    severities = []
+    for item in spec.split(","):
+        severity, _, weight = item.strip().partition(":")
+        if severity not in SEVERITIES:
+            raise ValueError("unknown severity %r (one of %s)" %
+                             (severity, ", ".join(SEVERITIES)))
+        severities.append((severity, float(weight) if weight else 1.0))
+    return severities
+
+
+class SeverityMix(object):
+    """Weighted random choice of severities."""
+
+    def __init__(self, severities):
+        self.names = []
+        self._totals = []
+        total = 0.0
+        for severity, weight in severities:
+            total += weight
+            self.names.append(severity)
+            self._totals.append(total)
+        if not total:
+            raise ValueError("no severity with positive weight")
+
+    def choose(self, rng):
+        index = bisect_right(self._totals, rng.random() * self._totals[-1])
+        return self.names[min(index, len(self.names) - 1)]
+
+
+class Tracker(object):
+    """Thread-safe record of sent and received sequence numbers."""
+
+    def __init__(self, run=None):
+        self.run = run or uuid.uuid4().hex[:8]
+        self.rpc_errors = 0
+        self.duplicates = 0
+        self.foreign = 0
+        self._sequence = itertools.count(1)
+        self._sent = {}        # sequence -> (time, severity)
+        self._received = {}    # sequence -> (time, severity code)
+        self._lock = threading.Lock()
+
+    def message(self):
+        """Next sequence number and its message text."""
+        with self._lock:
+            sequence = next(self._sequence)
+        return sequence, "%s %s %d" % (MARKER, self.run, sequence)
+
+    def sending(self, sequence, severity):
+        # recorded before the RPC, the message may arrive before its reply
+        with self._lock:
+            self._sent[sequence] = (default_timer(), severity)
+
+    def failed(self, sequence):
+        with self._lock:
+            self._sent.pop(sequence, None)
+            self.rpc_errors += 1
+
+    def receive(self, datagram, arrival):
+        """Record a received syslog datagram."""
+        match = DATAGRAM.match(datagram.decode("utf-8", "replace"))
+        with self._lock:
+            if match is None or match.group("run") != self.run:
+                self.foreign += 1
+                return
+            sequence = int(match.group("sequence"))
+            if sequence in self._received:
+                self.duplicates += 1
+                return
+            pri = match.group("pri")
+            self._received[sequence] = (arrival, int(pri) & 7 if pri
+                                        else None)
+
+    def report(self):
+        """Totals, latencies and per-severity counts of the run."""
+        with self._lock:
+            sent = dict(self._sent)
+            received = dict(self._received)
+        latencies = []
+        severities = dict((name, [0, 0]) for name in SEVERITIES)
+        mismatched = 0
+        for sequence, (start, severity) in sent.items():
+            counts = severities[severity]
+            counts[0] += 1
+            if sequence in received:
+                arrival, code = received[sequence]
+                latencies.append(arrival - start)
+                counts[1] += 1
+                if code is not None and SEVERITIES[code] != severity:
+                    mismatched += 1
+        matched = len(latencies)
+        return dict(sent=len(sent), received=matched,
+                    lost=len(sent) - matched,
+                    loss=100.0 * (len(sent) - matched) / len(sent)
+                    if sent else 0.0,
+                    unmatched=len(received) - matched,
+                    duplicates=self.duplicates, foreign=self.foreign,
+                    mismatched=mismatched, rpc_errors=self.rpc_errors,
+                    p50=percentile(latencies, 50),
+                    p90=percentile(latencies, 90),
+                    p99=percentile(latencies, 99),
+                    max=max(latencies) if latencies else None,
+                    severities=dict((name, tuple(counts)) for name, counts
+                                    in severities.items() if counts[0]))
+
+
+class SyslogListener(object):
+    """UDP syslog receiver feeding a tracker from a thread."""
+
+    def __init__(self, tracker, address="0.0.0.0", port=5140):
+        self.tracker = tracker
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            # a burst of messages must not overflow the default buffer
+            self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF,
+                                    4 * 1024 * 1024)
+        except socket.error as error:
+            logger.debug("Cannot set receive buffer: %s", error)
+        self._socket.bind((address, port))
+        self._socket.settimeout(0.2)
+        self.address = self._socket.getsockname()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._receive)
+        self._thread.daemon = True
+
+    def start(self):
+        self._thread.start()
+        logger.info("Listening for syslog on %s:%s", *self.address)
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self._socket.close()
+
+    def _receive(self):
+        while not self._stop.is_set():
+            try:
+                datagram = self._socket.recv(65535)
+            except socket.timeout:
+                continue
+            self.tracker.receive(datagram, default_timer())
+
+
+def session_worker(url, bucket, app, mix, tracker, stop, seed,
+                   factory=create_provider):
+    """Log messages on one device over one session until stop is set."""
+    from ydk.services import ExecutorService
+    from ydk.models.ietf import ietf_syslog_types
+
+    rng = random.Random(seed)
+    executor = ExecutorService()
+    rpc = app.build()
+    provider = None
+    try:
+        provider = factory(url)
+        while not stop.is_set():
+            delay = bucket.take()
+            if delay:
+                time.sleep(delay)
+            if stop.is_set():
+                break
+            severity = mix.choose(rng)
+            sequence, message = tracker.message()
+            rpc.input.message = message
+            rpc.input.severity = getattr(ietf_syslog_types.SeverityEnum,
+                                         severity)
+            tracker.sending(sequence, severity)
+            try:
+                executor.execute_rpc(provider, rpc)
+            except Exception as error:
+                logger.debug("logmsg %d on %s failed: %s", sequence, url,
+                             error)
+                tracker.failed(sequence)
+    except Exception as error:
+        device = parse_device(url)
+        logger.error("Session to %s:%s failed: %s", device["address"],
+                     device["port"], error)
+    finally:
+        if provider is not None:
+            try:
+                provider.close()
+            except Exception as error:
+                logger.debug("Error closing session: %s", error)
+
+
+def run_load(urls, app, mix, tracker, sessions=1, rate=100.0,
+             duration=10.0, burst=1, seed=0, factory=create_provider):
+    """Log messages on all devices for duration seconds; return elapsed."""
+    stop = threading.Event()
+    threads = []
+    for index, url in enumerate(urls):
+        bucket = TokenBucket(rate, burst)
+        for session in range(sessions):
+            thread = threading.Thread(
+                target=session_worker,
+                args=(url, bucket, app, mix, tracker, stop,
+                      seed + index * sessions + session, factory))
+            thread.daemon = True
+            threads.append(thread)
+    start = default_timer()
+    for thread in threads:
+        thread.start()
+    try:
+        time.sleep(duration)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    return default_timer() - start
+
+
+def _ms(seconds):
+    return "-" if seconds is None else "%.1f" % (seconds * 1000.0)
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-v", "--verbose", help="print debugging messages",
+                        action="store_true")
+    parser.add_argument("-l", "--listen", default="5140",
+                        help="[ADDRESS:]PORT of the syslog listener")
+    parser.add_argument("-s", "--sessions", type=int, default=1,
+                        help="sessions per device")
+    parser.add_argument("-r", "--rate", type=float, default=100.0,
+                        help="messages per second per device")
+    parser.add_argument("-d", "--duration", type=float, default=10.0,
+                        help="seconds to send messages")
+    parser.add_argument("-b", "--burst", type=int, default=1,
+                        help="token bucket size")
+    parser.add_argument("--severity", default="info",
+                        help="severity mix (SEVERITY[:WEIGHT],...)")
+    parser.add_argument("--drain", type=float, default=2.0,
+                        help="seconds to wait for messages after sending")
+    parser.add_argument("--max-loss", type=float, default=0.0,
+                        help="loss in percent above which the exit status "
+                             "is 1")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="random seed of the severity mix")
+    parser.add_argument("inventory",
+                        help="file with one device URL per line "
+                             "('-' for stdin)")
+    parser.add_argument("app", nargs="?", default=LOGMSG_APP,
+                        help="syslog-act app with prepare_logmsg_rpc "
+                             "function")
+    args = parser.parse_args()
+    enable_logging(args.verbose)
+
+    app = SampleApp(args.app)
+    if app.object_class != "LogmsgRpc":
+        parser.error("%s does not prepare a LogmsgRpc" % app.name)
+    try:
+        mix = SeverityMix(parse_severities(args.severity))
+    except ValueError as error:
+        parser.error(str(error))
+    inventory = sys.stdin if args.inventory == "-" else open(args.inventory)
+    urls = list(read_inventory(inventory))
+
+    address, _, port = args.listen.rpartition(":")
+    tracker = Tracker()
+    listener = SyslogListener(tracker, address or "0.0.0.0", int(port))
+    listener.start()
+    elapsed = run_load(urls, app, mix, tracker, args.sessions, args.rate,
+                       args.duration, args.burst, args.seed)
+    time.sleep(args.drain)
+    listener.stop()
+
+    report = tracker.report()
+    print("run {run}: sent {sent} messages from {devices} devices in "
+          "{time:.1f}s ({rate:.1f}/s), {rpc_errors} RPC errors".format(
+              run=tracker.run, devices=len(urls), time=elapsed,
+              rate=report["sent"] / elapsed if elapsed else 0.0, **report))
+    print("received {received}, lost {lost} ({loss:.2f}%), {duplicates} "
+          "duplicates, {mismatched} with other severity, {unmatched} "
+          "unmatched, {foreign} foreign".format(**report))
+    print("latency ms: p50 {p50} p90 {p90} p99 {p99} max {max}".format(
+        p50=_ms(report["p50"]), p90=_ms(report["p90"]),
+        p99=_ms(report["p99"]), max=_ms(report["max"])))
+    print("{:<10} {:>9} {:>9} {:>8}".format("severity", "sent", "received",
+                                            "loss %"))
+    for severity in SEVERITIES:
+        if severity in report["severities"]:
+            sent, received = report["severities"][severity]
+            print("{:<10} {:>9} {:>9} {:>8.2f}".format(
+                severity, sent, received, 100.0 * (sent - received) / sent))
+    sys.exit(1 if report["loss"] > args.max_loss else 0)
+# End of script
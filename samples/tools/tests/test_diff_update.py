@@ -0,0 +1,49 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Tests of diff_update.py with generated model classes."""
+
+import pytest
+
+from diff_update import diff
+
+ietf_netconf = pytest.importorskip("ydk.models.ietf.ietf_netconf")
+openconfig_bgp = pytest.importorskip("ydk.models.openconfig.openconfig_bgp")
+
+
+def test_enum_leaf_change_is_sent():
+    operation = ietf_netconf.EditConfigRpc.Input.DefaultOperationEnum
+    current = ietf_netconf.EditConfigRpc()
+    current.input.default_operation = operation.merge
+    desired = ietf_netconf.EditConfigRpc()
+    desired.input.default_operation = operation.replace
+
+    changes = diff(current, desired)
+
+    assert changes.changed_leafs == 1
+    assert changes.merge.input.default_operation == operation.replace
+
+
+def test_leaf_list_values_are_copied():
+    current = openconfig_bgp.Bgp()
+    current.global_.confederation.config.member_as.append(1)
+    desired = openconfig_bgp.Bgp()
+    desired.global_.confederation.config.member_as.extend([1, 2])
+
+    changes = diff(current, desired)
+
+    member_as = changes.merge.global_.confederation.config.member_as
+    assert [item.item for item in member_as] == [1, 2]
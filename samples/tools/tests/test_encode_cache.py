@@ -0,0 +1,53 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Tests of encode_cache.py with generated model classes."""
+
+import pytest
+
+from encode_cache import fingerprint
+
+ietf_netconf = pytest.importorskip("ydk.models.ietf.ietf_netconf")
+xr_clns_isis_cfg = pytest.importorskip(
+    "ydk.models.cisco_ios_xr.Cisco_IOS_XR_clns_isis_cfg")
+
+
+def _edit_config(operation):
+    rpc = ietf_netconf.EditConfigRpc()
+    rpc.input.default_operation = operation
+    return rpc
+
+
+def test_enum_leafs_change_fingerprint():
+    operation = ietf_netconf.EditConfigRpc.Input.DefaultOperationEnum
+    assert fingerprint(_edit_config(operation.merge)) == \
+        fingerprint(_edit_config(operation.merge))
+    assert fingerprint(_edit_config(operation.merge)) != \
+        fingerprint(_edit_config(operation.replace))
+
+
+def _isis(names):
+    isis = xr_clns_isis_cfg.Isis()
+    for name in names:
+        instance = isis.instances.Instance()
+        instance.instance_name = name
+        isis.instances.instance.append(instance)
+    return isis
+
+
+def test_list_order_changes_fingerprint():
+    assert fingerprint(_isis(["A", "B"])) == fingerprint(_isis(["A", "B"]))
+    assert fingerprint(_isis(["A", "B"])) != fingerprint(_isis(["B", "A"]))
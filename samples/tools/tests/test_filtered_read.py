@@ -0,0 +1,43 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Tests of filtered_read.py with generated model classes."""
+
+import pytest
+
+from filtered_read import add_selection, class_name, parse_selection
+
+xr_clns_isis_oper = pytest.importorskip(
+    "ydk.models.cisco_ios_xr.Cisco_IOS_XR_clns_isis_oper")
+xr_clns_isis_datatypes = pytest.importorskip(
+    "ydk.models.cisco_ios_xr.Cisco_IOS_XR_clns_isis_datatypes")
+
+
+def test_class_name_keeps_keyword_underscore():
+    assert class_name("vrf_prefix") == "VrfPrefix"
+    assert class_name("global_") == "Global_"
+
+
+def test_enum_key_converted():
+    isis = xr_clns_isis_oper.Isis()
+    selection = ("instances.instance[instance_name=DEFAULT]"
+                 ".levels.level[level=level2].adjacencies")
+    add_selection(isis, parse_selection(selection, {}))
+    instance = isis.instances.instance[0]
+    assert instance.instance_name == "DEFAULT"
+    level = instance.levels.level[0]
+    assert level.level == xr_clns_isis_datatypes.IsisInternalLevelEnum.level2
+    assert level.adjacencies is not None
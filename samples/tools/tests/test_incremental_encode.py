@@ -0,0 +1,43 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Tests of incremental_encode.py with generated model classes."""
+
+import pytest
+
+from incremental_encode import IncrementalEncoder, add_neighbors
+
+oc_bgp = pytest.importorskip("ydk.models.openconfig.openconfig_bgp")
+services = pytest.importorskip("ydk.services")
+providers = pytest.importorskip("ydk.providers")
+
+
+def test_unmarked_changes_encoded():
+    codec = services.CodecService()
+    provider = providers.CodecServiceProvider(type="xml")
+    bgp = oc_bgp.Bgp()
+    bgp.global_.config.as_ = 65001
+    neighbors = add_neighbors(bgp, 3)
+    encoder = IncrementalEncoder(codec, provider)
+    assert encoder.encode(bgp) == codec.encode(provider, bgp)
+
+    # neither change is marked with changed()
+    neighbors[1].config.description = "changed"
+    bgp.global_.config.as_ = 65002
+    assert encoder.encode(bgp) == codec.encode(provider, bgp)
+    assert encoder.stats["frames"] == 2
+    assert encoder.stats["unmarked"] == 1
+    assert encoder.stats["reused"] == 2
@@ -0,0 +1,35 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""End-to-end round trip of isis_scale.py with generated model classes."""
+
+import pytest
+
+from isis_scale import generate_isis, round_trip
+
+pytest.importorskip("ydk.models.cisco_ios_xr.Cisco_IOS_XR_clns_isis_cfg")
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_round_trip(seed):
+    from ydk.services import CodecService
+    from ydk.providers import CodecServiceProvider
+
+    provider = CodecServiceProvider(type="xml")
+    isis = generate_isis(20, instances=2, afs=4, seed=seed)
+    payload, again = round_trip(CodecService(), provider, isis)
+    assert "<instance>" in payload
+    assert again == payload
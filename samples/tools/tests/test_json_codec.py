@@ -0,0 +1,50 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Tests of json_codec.py with generated model classes."""
+
+import json
+
+import pytest
+
+from json_codec import encode_json, to_json
+
+ietf_netconf = pytest.importorskip("ydk.models.ietf.ietf_netconf")
+openconfig_bgp = pytest.importorskip("ydk.models.openconfig.openconfig_bgp")
+
+
+def test_enum_leaf():
+    rpc = ietf_netconf.EditConfigRpc()
+    rpc.input.default_operation = \
+        ietf_netconf.EditConfigRpc.Input.DefaultOperationEnum.replace
+    assert to_json(rpc.input, "ietf-netconf") == \
+        {"default-operation": "replace"}
+
+
+def test_leaf_list_items():
+    bgp = openconfig_bgp.Bgp()
+    bgp.global_.config.as_ = 65001
+    bgp.global_.confederation.config.member_as.extend([65002, 65003])
+    document = json.loads(encode_json(bgp))
+    assert document == {"openconfig-bgp:bgp": {"global": {
+        "config": {"as": 65001},
+        "confederation": {"config": {"member-as": [65002, 65003]}}}}}
+
+
+def test_uint64_as_string():
+    sent = openconfig_bgp.Bgp.Neighbors.Neighbor.State.Messages.Sent()
+    sent.notification = 5
+    assert to_json(sent, "openconfig-bgp") == {"NOTIFICATION": "5"}
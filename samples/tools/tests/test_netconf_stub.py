@@ -0,0 +1,63 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Tests of the netconf_stub.py datastore."""
+
+import xml.etree.ElementTree as etree
+
+import pytest
+
+from netconf_stub import Datastore
+
+IFMGR_NS = "http://cisco.com/ns/yang/Cisco-IOS-XR-ifmgr-cfg"
+TEST_NS = "urn:samples:test"
+
+
+def _interfaces(*entries):
+    return etree.fromstring(
+        '<interface-configurations xmlns="%s">%s</interface-configurations>'
+        % (IFMGR_NS, "".join(
+            "<interface-configuration><active>act</active>"
+            "<interface-name>%s</interface-name>"
+            "<description>%s</description></interface-configuration>"
+            % entry for entry in entries)))
+
+
+def _entries(datastore, path):
+    return [[(child.text or "").strip() for child in entry]
+            for entry in datastore.root.iterfind(path)]
+
+
+def test_two_key_list_with_model():
+    pytest.importorskip("ydk.models.cisco_ios_xr.Cisco_IOS_XR_ifmgr_cfg")
+    datastore = Datastore()
+    datastore.edit([_interfaces(("Gi0/0/0/0", "a"))])
+    datastore.edit([_interfaces(("Gi0/0/0/1", "b"))])
+    datastore.edit([_interfaces(("Gi0/0/0/0", "c"))])
+    path = "{%s}interface-configurations/{%s}interface-configuration" % (
+        IFMGR_NS, IFMGR_NS)
+    assert _entries(datastore, path) == [["act", "Gi0/0/0/0", "c"],
+                                         ["act", "Gi0/0/0/1", "b"]]
+
+
+def test_two_key_list_without_model():
+    datastore = Datastore()
+    for name, value in (("x", "1"), ("y", "2")):
+        datastore.edit([etree.fromstring(
+            '<things xmlns="%s"><thing><a>1</a><b>%s</b><c>%s</c></thing>'
+            '</things>' % (TEST_NS, name, value))])
+    path = "{%s}things/{%s}thing" % (TEST_NS, TEST_NS)
+    assert _entries(datastore, path) == [["1", "x", "1"], ["1", "y", "2"]]
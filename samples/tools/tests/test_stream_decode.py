@@ -0,0 +1,86 @@
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Tests of stream_decode.py with generated model classes."""
+
+import io
+
+import pytest
+
+from stream_decode import decode, iter_entries
+
+xr_clns_isis_cfg = pytest.importorskip(
+    "ydk.models.cisco_ios_xr.Cisco_IOS_XR_clns_isis_cfg")
+xr_clns_isis_datatypes = pytest.importorskip(
+    "ydk.models.cisco_ios_xr.Cisco_IOS_XR_clns_isis_datatypes")
+
+
+def _isis():
+    """Isis object with nested lists, enums and a presence container."""
+    isis = xr_clns_isis_cfg.Isis()
+    for name in ("A", "B"):
+        instance = isis.instances.Instance()
+        instance.instance_name = name
+        instance.is_type = xr_clns_isis_cfg.IsisConfigurableLevelsEnum.level2
+        net = instance.nets.Net()
+        net.net_name = "49.0000.1720.1625.5%03d.00" % len(name)
+        instance.nets.net.append(net)
+        af = instance.afs.Af()
+        af.af_name = xr_clns_isis_datatypes.IsisAddressFamilyEnum.ipv4
+        af.saf_name = xr_clns_isis_datatypes.IsisSubAddressFamilyEnum.unicast
+        af.af_data = af.AfData()
+        af.af_data.parent = af
+        instance.afs.af.append(af)
+        isis.instances.instance.append(instance)
+    stagger = isis.instances.instance[0].AdjacencyStagger()
+    stagger.initial_nbr = 2
+    stagger.max_nbr = 4
+    stagger.parent = isis.instances.instance[0]
+    isis.instances.instance[0].adjacency_stagger = stagger
+    return isis
+
+
+def _encode(entity):
+    from ydk.services import CodecService
+    from ydk.providers import CodecServiceProvider
+
+    return CodecService().encode(CodecServiceProvider(type="xml"), entity)
+
+
+def test_decode_round_trip():
+    payload = _encode(_isis())
+    isis = decode(io.BytesIO(payload.encode("utf-8")), xr_clns_isis_cfg.Isis)
+
+    instance = isis.instances.instance[0]
+    assert instance.is_type == \
+        xr_clns_isis_cfg.IsisConfigurableLevelsEnum.level2
+    assert instance.nets.net[0].parent is instance.nets
+    assert instance.afs.af[0].af_name == \
+        xr_clns_isis_datatypes.IsisAddressFamilyEnum.ipv4
+    assert instance.adjacency_stagger.max_nbr == 4
+    assert isis.instances.instance[1].adjacency_stagger is None
+    assert _encode(isis) == payload
+
+
+def test_iter_entries_nested_lists():
+    payload = _encode(_isis())
+    entries = list(iter_entries(io.BytesIO(payload.encode("utf-8")),
+                                xr_clns_isis_cfg.Isis,
+                                "isis/instances/instance"))
+
+    assert [entry.instance_name for entry in entries] == ["A", "B"]
+    assert entries[1].afs.af[0].saf_name == \
+        xr_clns_isis_datatypes.IsisSubAddressFamilyEnum.unicast
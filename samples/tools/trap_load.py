@@ -0,0 +1,365 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Generate SNMP test traps at a controlled rate on many devices.
+
+Traps are triggered with the RPCs of Cisco-IOS-XR-snmp-test-trap-act, each
+prepared by the prepare_*_rpc function of an nc-execute app.  Apps are
+given as [WEIGHT:]PATH (a file or a directory of apps, weight 1 by default)
+and every trap picks an app at random in proportion to its weight.  Each
+device gets SESSIONS NETCONF sessions, each sending one RPC at a time,
+paced by a token bucket per device that releases RATE traps per second
+(with bursts of up to BURST traps).
+
+The rate starts at RATE and grows by STEP traps per second every
+INTERVAL seconds.  For every interval, the target and achieved rate,
+RPC latency percentiles and errors are printed.  An interval falls
+behind when the achieved rate is below the target by more than TOLERANCE
+percent or RPCs fail, i.e. the sessions are blocked by slow replies from
+the device (or its trap receiver); the first such rate is reported as the
+fall-behind point.  At the end, a latency histogram is printed per RPC.
+
+usage: trap_load.py [-h] [-v] [-s SESSIONS] [-r RATE] [--step STEP]
+                    [-i INTERVAL] [-d DURATION] [-b BURST]
+                    [-t TOLERANCE] [--seed SEED]
+                    inventory [app [app ...]]
+
+positional arguments:
+  inventory             file with one device URL per line ('-' for stdin)
+  app                   [WEIGHT:]PATH of snmp-test-trap-act apps (default:
+                        all)
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -v, --verbose         print debugging messages
+  -s SESSIONS, --sessions SESSIONS
+                        sessions per device
+  -r RATE, --rate RATE  initial traps per second per device
+  --step STEP           rate increase per interval
+  -i INTERVAL, --interval INTERVAL
+                        seconds per interval
+  -d DURATION, --duration DURATION
+                        seconds to run
+  -b BURST, --burst BURST
+                        token bucket size
+  -t TOLERANCE, --tolerance TOLERANCE
+                        shortfall in percent that counts as falling behind
+  --seed SEED           random seed of the trap mix
+"""
+
+from argparse import ArgumentParser
+from bisect import bisect_left, bisect_right
+from timeit import default_timer
+import logging
+import os
+import random
+import sys
+import threading
+import time
+
+from sample_app import find_apps, parse_device, enable_logging
+from session_pool import create_provider
+from fleet_runner import read_inventory
+from benchmark import percentile
+
+TRAP_APPS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..",
+                         "basic", "executor", "models", "cisco-ios-xr",
+                         "Cisco-IOS-XR-snmp-test-trap-act")
+
+# upper bounds of latency histogram buckets in milliseconds
+BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+logger = logging.getLogger("ydk.samples.trap_load")
+
+
+class TokenBucket(object):
+    """Thread-safe token bucket releasing rate tokens per second."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.burst = burst
+        self._tokens = float(burst)
+        self._time = default_timer()
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate):
+        with self._lock:
+            self._refill()
+            self.rate = float(rate)
+
+    def take(self):
+        """Reserve one token; return seconds to wait before using it."""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def _refill(self):
+        now = default_timer()
+        self._tokens = min(self.burst,
+                           self._tokens + (now - self._time) * self.rate)
+        self._time = now
+
+
+class TrapMix(object):
+    """Weighted random choice of prepared RPC objects."""
+
+    def __init__(self, weighted_apps):
+        self.names = []
+        self.rpcs = []
+        self._totals = []
+        total = 0.0
+        for weight, app in weighted_apps:
+            total += weight
+            self.names.append(app.object_class)
+            self.rpcs.append(app.build())
+            self._totals.append(total)
+        if not total:
+            raise ValueError("no trap apps with positive weight")
+
+    def choose(self, rng):
+        """Name and RPC object of a random trap."""
+        index = bisect_right(self._totals, rng.random() * self._totals[-1])
+        index = min(index, len(self.rpcs) - 1)
+        return self.names[index], self.rpcs[index]
+
+
+def parse_mix(specs):
+    """Yield (weight, app) for [WEIGHT:]PATH specifications."""
+    for spec in specs:
+        weight, _, path = spec.partition(":")
+        try:
+            weight = float(weight)
+        except ValueError:
+            weight, path = 1.0, spec
+        if not path:
+            weight, path = 1.0, spec
+        for app in find_apps([path], prefix="nc-execute"):
+            yield weight, app
+
+
+class Histogram(object):
+    """Latency counts in BUCKETS."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+
+    def add(self, seconds):
+        self.counts[bisect_left(BUCKETS, seconds * 1000.0)] += 1
+
+    def lines(self):
+        """Printable bucket lines with a bar of relative size."""
+        total = sum(self.counts) or 1
+        lines = []
+        lower = 0
+        for bound, count in zip(BUCKETS + (None,), self.counts):
+            label = ("%d-%d ms" % (lower, bound) if bound is not None
+                     else ">%d ms" % lower)
+            lower = bound
+            if count:
+                lines.append("  {label:>13} {count:>8} {bar}".format(
+                    label=label, count=count,
+                    bar="#" * max(1, 40 * count // total)))
+        return lines
+
+
+class Recorder(object):
+    """Thread-safe collection of RPC results per interval."""
+
+    def __init__(self):
+        self.histograms = {}
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._latencies = []
+        self._errors = 0
+
+    def add(self, name, latency, error=None):
+        with self._lock:
+            if error is None:
+                self._latencies.append(latency)
+                self.histograms.setdefault(name, Histogram()).add(latency)
+            else:
+                self._errors += 1
+
+    def interval(self):
+        """Latencies and error count since the last call."""
+        with self._lock:
+            result = self._latencies, self._errors
+            self._reset()
+        return result
+
+
+def session_worker(url, bucket, mix, recorder, stop, seed,
+                   factory=create_provider):
+    """Send traps to one device over one session until stop is set."""
+    from ydk.services import ExecutorService
+
+    rng = random.Random(seed)
+    executor = ExecutorService()
+    provider = None
+    try:
+        provider = factory(url)
+        while not stop.is_set():
+            delay = bucket.take()
+            if delay:
+                time.sleep(delay)
+            if stop.is_set():
+                break
+            name, rpc = mix.choose(rng)
+            start = default_timer()
+            try:
+                executor.execute_rpc(provider, rpc)
+            except Exception as error:
+                logger.debug("%s on %s failed: %s", name, url, error)
+                recorder.add(name, default_timer() - start, error)
+            else:
+                recorder.add(name, default_timer() - start)
+    except Exception as error:
+        device = parse_device(url)
+        logger.error("Session to %s:%s failed: %s", device["address"],
+                     device["port"], error)
+    finally:
+        if provider is not None:
+            try:
+                provider.close()
+            except Exception as error:
+                logger.debug("Error closing session: %s", error)
+
+
+def run_load(urls, mix, sessions=1, rate=10.0, step=0.0, interval=5.0,
+             duration=60.0, burst=1, tolerance=5.0, seed=0,
+             factory=create_provider):
+    """Run traps on all devices; yield one result dict per interval."""
+    stop = threading.Event()
+    recorder = Recorder()
+    buckets = []
+    threads = []
+    for index, url in enumerate(urls):
+        bucket = TokenBucket(rate, burst)
+        buckets.append(bucket)
+        for session in range(sessions):
+            thread = threading.Thread(
+                target=session_worker,
+                args=(url, bucket, mix, recorder, stop,
+                      seed + index * sessions + session, factory))
+            thread.daemon = True
+            threads.append(thread)
+    for thread in threads:
+        thread.start()
+
+    target = rate
+    start = default_timer()
+    recorder.interval()
+    try:
+        while default_timer() - start < duration:
+            interval_start = default_timer()
+            time.sleep(min(interval, duration - (interval_start - start)))
+            latencies, errors = recorder.interval()
+            elapsed = default_timer() - interval_start
+            achieved = len(latencies) / elapsed / max(len(buckets), 1)
+            yield dict(time=default_timer() - start, target=target,
+                       achieved=achieved, errors=errors,
+                       p50=percentile(latencies, 50),
+                       p99=percentile(latencies, 99),
+                       behind=(errors > 0 or achieved <
+                               target * (1 - tolerance / 100.0)),
+                       histograms=recorder.histograms)
+            if step:
+                target += step
+                for bucket in buckets:
+                    bucket.set_rate(target)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+def _ms(seconds):
+    return "-" if seconds is None else "%.1f" % (seconds * 1000.0)
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-v", "--verbose", help="print debugging messages",
+                        action="store_true")
+    parser.add_argument("-s", "--sessions", type=int, default=1,
+                        help="sessions per device")
+    parser.add_argument("-r", "--rate", type=float, default=10.0,
+                        help="initial traps per second per device")
+    parser.add_argument("--step", type=float, default=0.0,
+                        help="rate increase per interval")
+    parser.add_argument("-i", "--interval", type=float, default=5.0,
+                        help="seconds per interval")
+    parser.add_argument("-d", "--duration", type=float, default=60.0,
+                        help="seconds to run")
+    parser.add_argument("-b", "--burst", type=int, default=1,
+                        help="token bucket size")
+    parser.add_argument("-t", "--tolerance", type=float, default=5.0,
+                        help="shortfall in percent that counts as falling "
+                             "behind")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="random seed of the trap mix")
+    parser.add_argument("inventory",
+                        help="file with one device URL per line "
+                             "('-' for stdin)")
+    parser.add_argument("app", nargs="*", default=[TRAP_APPS],
+                        help="[WEIGHT:]PATH of snmp-test-trap-act apps "
+                             "(default: all)")
+    args = parser.parse_args()
+    enable_logging(args.verbose)
+
+    mix = TrapMix(parse_mix(args.app))
+    inventory = sys.stdin if args.inventory == "-" else open(args.inventory)
+    urls = list(read_inventory(inventory))
+
+    print("{:>8} {:>9} {:>9} {:>9} {:>9} {:>7}".format(
+        "time", "target/s", "actual/s", "p50 ms", "p99 ms", "errors"))
+    fall_behind = last = None
+    for result in run_load(urls, mix, args.sessions, args.rate, args.step,
+                           args.interval, args.duration, args.burst,
+                           args.tolerance, args.seed):
+        last = result
+        if result["behind"] and fall_behind is None:
+            fall_behind = result
+        print("{time:>8.1f} {target:>9.1f} {achieved:>9.1f} {p50:>9} "
+              "{p99:>9} {errors:>7}{mark}".format(
+                  time=result["time"], target=result["target"],
+                  achieved=result["achieved"], p50=_ms(result["p50"]),
+                  p99=_ms(result["p99"]), errors=result["errors"],
+                  mark="  behind" if result["behind"] else ""))
+    if last is None:
+        exit()
+
+    for name, histogram in sorted(last["histograms"].items()):
+        print(name)
+        for line in histogram.lines():
+            print(line)
+    if fall_behind is None:
+        print("kept up with {rate:.1f} traps/s per device on {devices} "
+              "devices".format(rate=last["target"], devices=len(urls)))
+    else:
+        print("fell behind at {target:.1f} traps/s per device "
+              "(achieved {achieved:.1f}/s, {errors} errors)".format(
+                  **fall_behind))
+    exit()
+# End of script
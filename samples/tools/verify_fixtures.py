@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+#
+# Copyright 2016 Cisco Systems, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Verify the XML fixtures of the basic apps against their app functions.
+
+For every app with a -ydk.xml fixture, the top-level object (or RPC) is
+built with the app function and encoded with CodecService.  Both documents
+are canonicalized and their SHA-256 digests compared.  The canonical form
+uses namespace URIs instead of prefixes (also in identityref values),
+ignores whitespace and comments, and sorts sibling elements by name, so
+documents that differ only in the order of containers and leafs are equal.
+Entries of a list keep their document order: reordering an ordered-by
+user list changes the configuration, and the meta information of YDK-Py
+0.5 does not record which lists are ordered-by system.  Apps are sharded
+by model directory (up to SHARD_SIZE apps per shard) across worker
+processes.
+
+usage: verify_fixtures.py [-h] [-v] [-j JOBS] [-m MODEL] [-p PREFIX] [-d]
+                          [path [path ...]]
+
+positional arguments:
+  path                  app file or directory (default: samples/basic)
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -v, --verbose         print debugging messages
+  -j JOBS, --jobs JOBS  worker processes (default: CPU count)
+  -m MODEL, --model MODEL
+                        only verify models containing MODEL
+  -p PREFIX, --prefix PREFIX
+                        only verify apps with PREFIX (e.g. cd-encode)
+  -d, --diff            print a diff of canonical forms for mismatches
+"""
+
+from argparse import ArgumentParser
+from collections import OrderedDict
+from timeit import default_timer
+import difflib
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import sys
+
+try:
+    from xml.etree import cElementTree as ElementTree
+except ImportError:
+    from xml.etree import ElementTree
+
+from sample_app import SampleApp, find_apps, enable_logging
+from bulk_static_routes import chunks
+
+SAMPLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..",
+                       "basic")
+
+# maximum apps verified by a worker at a time
+SHARD_SIZE = 8
+
+logger = logging.getLogger("ydk.samples.verify_fixtures")
+
+
+def parse(payload):
+    """Parse XML text; return root element and prefix to URI mapping."""
+    if not isinstance(payload, bytes):
+        payload = payload.encode("utf-8")
+    namespaces = {}
+    root = None
+    for event, item in ElementTree.iterparse(io.BytesIO(payload),
+                                             ("start-ns", "start")):
+        if event == "start-ns":
+            namespaces[item[0]] = item[1]
+        elif root is None:
+            root = item
+    return root, namespaces
+
+
+def _value(text, namespaces):
+    """Whitespace-stripped text with a namespace prefix resolved."""
+    text = (text or "").strip()
+    prefix, _, name = text.partition(":")
+    if name and prefix in namespaces and " " not in text:
+        return "{%s}%s" % (namespaces[prefix], name)
+    return text
+
+
+def canonical_lines(element, namespaces, indent=0):
+    """Canonical form of element as a list of indented lines.
+
+    Siblings are sorted by name; siblings of the same name (list entries)
+    keep their document order.
+    """
+    attributes = " ".join("%s=%s" % (name, _value(value, namespaces))
+                          for name, value in sorted(element.attrib.items())
+                          if not name.startswith("{http://www.w3.org/"))
+    head = "  " * indent + element.tag + (" " + attributes
+                                          if attributes else "")
+    text = _value(element.text, namespaces)
+    children = [child for child in element
+                if isinstance(child.tag, str)]  # skip comments
+    # stable sort keeps entries of the same list in order
+    children.sort(key=lambda child: child.tag)
+    lines = [head + (" = " + text if text else "")]
+    for child in children:
+        lines.extend(canonical_lines(child, namespaces, indent + 1))
+    return lines
+
+
+def canonical(payload):
+    """Canonical form of an XML document as text."""
+    root, namespaces = parse(payload)
+    return "\n".join(canonical_lines(root, namespaces))
+
+
+def digest(form):
+    """SHA-256 digest of a canonical form."""
+    return hashlib.sha256(form.encode("utf-8")).hexdigest()
+
+
+def verify_model(task):
+    """Verify the fixtures of one shard of apps (runs in a worker).
+
+    Returns a list of (app name, status, detail) with status ok, mismatch
+    or error; detail is a diff or error message.
+    """
+    paths, show_diff = task
+    from ydk.services import CodecService
+    from ydk.providers import CodecServiceProvider
+
+    provider = CodecServiceProvider(type="xml")
+    codec = CodecService()
+    results = []
+    for path in paths:
+        name = os.path.basename(path)
+        try:
+            app = SampleApp(path)
+            payload = codec.encode(provider,
+                                   app.call_argument(app.build()))
+            with open(app.fixture(".xml"), "rb") as fixture:
+                expected = fixture.read()
+            actual_form = canonical(payload)
+            expected_form = canonical(expected)
+            if digest(actual_form) == digest(expected_form):
+                results.append((name, "ok", None))
+            else:
+                detail = None
+                if show_diff:
+                    detail = "\n".join(difflib.unified_diff(
+                        expected_form.splitlines(),
+                        actual_form.splitlines(), "fixture", "encoded",
+                        lineterm=""))
+                results.append((name, "mismatch", detail))
+        except Exception as error:
+            logger.debug("Verifying %s failed", name, exc_info=True)
+            results.append((name, "error",
+                            "%s: %s" % (type(error).__name__, error)))
+    provider.close()
+    return results
+
+
+def model_tasks(paths, model_filter=None, prefix=None, show_diff=False):
+    """Group apps with XML fixtures into shards of one model directory."""
+    models = OrderedDict()
+    for app in find_apps(paths, prefix=prefix):
+        if app.fixture(".xml") is None:
+            continue
+        model = os.path.basename(os.path.dirname(app.path))
+        if model_filter and model_filter not in model:
+            continue
+        models.setdefault(model, []).append(app.path)
+    return [(shard, show_diff)
+            for files in models.values()
+            for shard in chunks(files, SHARD_SIZE)]
+
+
+if __name__ == "__main__":
+    """Execute main program."""
+    parser = ArgumentParser()
+    parser.add_argument("-v", "--verbose", help="print debugging messages",
+                        action="store_true")
+    parser.add_argument("-j", "--jobs", type=int,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("-m", "--model",
+                        help="only verify models containing MODEL")
+    parser.add_argument("-p", "--prefix",
+                        help="only verify apps with PREFIX (e.g. cd-encode)")
+    parser.add_argument("-d", "--diff", action="store_true",
+                        help="print a diff of canonical forms for "
+                             "mismatches")
+    parser.add_argument("path", nargs="*", default=[SAMPLES],
+                        help="app file or directory (default: "
+                             "samples/basic)")
+    args = parser.parse_args()
+    enable_logging(args.verbose)
+
+    tasks = model_tasks(args.path, args.model, args.prefix, args.diff)
+    counts = OrderedDict([("ok", 0), ("mismatch", 0), ("error", 0)])
+    start = default_timer()
+    pool = multiprocessing.Pool(args.jobs)
+    for results in pool.imap_unordered(verify_model, tasks):
+        for name, status, detail in results:
+            counts[status] += 1
+            if status != "ok":
+                print("{status:<8} {name}".format(status=status, name=name))
+                if detail:
+                    print(detail)
+    pool.close()
+    pool.join()
+    print("{total} fixtures in {time:.3f}s: {counts}".format(
+        total=sum(counts.values()), time=default_timer() - start,
+        counts=", ".join("%d %s" % (n, s) for s, n in counts.items())))
+    sys.exit(1 if counts["mismatch"] or counts["error"] else 0)
+# End of script